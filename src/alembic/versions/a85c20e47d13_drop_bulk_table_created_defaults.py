@@ -0,0 +1,31 @@
+"""Drop server-side created_at defaults on bulk-inserted tables
+
+Revision ID: a85c20e47d13
+Revises: f4a61b3d9c80
+Create Date: 2025-07-12 15:02:41.778034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a85c20e47d13'
+down_revision: Union[str, Sequence[str], None] = 'f4a61b3d9c80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # created_at is now populated client-side for these high-volume tables
+    op.alter_column('transcription_lines', 'created_at', server_default=None)
+    op.alter_column('audio_segments', 'created_at', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('audio_segments', 'created_at', server_default=sa.text('now()'))
+    op.alter_column('transcription_lines', 'created_at', server_default=sa.text('now()'))
@@ -0,0 +1,30 @@
+"""Add composite indexes for audio segments and edit requests
+
+Revision ID: b9d3f07c6a21
+Revises: e7b2c58a104f
+Create Date: 2025-07-12 13:05:19.664108
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d3f07c6a21'
+down_revision: Union[str, Sequence[str], None] = 'e7b2c58a104f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_audio_segments_file_line', 'audio_segments', ['audio_file_id', 'transcription_line_id'])
+    op.create_index('ix_edit_requests_project_status', 'edit_requests', ['project_id', 'status'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_edit_requests_project_status', table_name='edit_requests')
+    op.drop_index('ix_audio_segments_file_line', table_name='audio_segments')
@@ -0,0 +1,39 @@
+"""Add uploaded_assets table
+
+Revision ID: c41f7a92d3be
+Revises: 5da84ebfa2dd
+Create Date: 2025-07-12 10:14:02.118473
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7a92d3be'
+down_revision: Union[str, Sequence[str], None] = '5da84ebfa2dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'uploaded_assets',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('original_name', sa.String(length=255), nullable=True),
+        sa.Column('file_path', sa.String(length=512), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('sample_rate', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('uploaded_assets')
@@ -0,0 +1,33 @@
+"""Add partial index over active edit requests
+
+Revision ID: d27e94b1c5f8
+Revises: a85c20e47d13
+Create Date: 2025-07-12 16:14:08.220951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27e94b1c5f8'
+down_revision: Union[str, Sequence[str], None] = 'a85c20e47d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_edit_requests_active',
+        'edit_requests',
+        ['project_id', 'requested_at'],
+        postgresql_where=sa.text("status IN ('pending', 'processing')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_edit_requests_active', table_name='edit_requests')
@@ -0,0 +1,30 @@
+"""Add composite lookup indexes for projects and transcription lines
+
+Revision ID: e7b2c58a104f
+Revises: c41f7a92d3be
+Create Date: 2025-07-12 11:42:37.905214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c58a104f'
+down_revision: Union[str, Sequence[str], None] = 'c41f7a92d3be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_project_id_owner', 'projects', ['id', 'owner_id'])
+    op.create_index('ix_tl_project_line', 'transcription_lines', ['project_id', 'line_index'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tl_project_line', table_name='transcription_lines')
+    op.drop_index('ix_project_id_owner', table_name='projects')
@@ -0,0 +1,54 @@
+"""Split transcription line words JSONB into parallel arrays
+
+Revision ID: f4a61b3d9c80
+Revises: b9d3f07c6a21
+Create Date: 2025-07-12 14:21:55.312670
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a61b3d9c80'
+down_revision: Union[str, Sequence[str], None] = 'b9d3f07c6a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transcription_lines', sa.Column('word_texts', sa.ARRAY(sa.Text()), nullable=True))
+    op.add_column('transcription_lines', sa.Column('word_starts', sa.ARRAY(sa.Float()), nullable=True))
+    op.add_column('transcription_lines', sa.Column('word_ends', sa.ARRAY(sa.Float()), nullable=True))
+
+    # Backfill from the old JSONB array-of-objects layout before dropping it
+    op.execute("""
+        UPDATE transcription_lines SET
+            word_texts = (SELECT array_agg(w->>'word') FROM jsonb_array_elements(words) AS w),
+            word_starts = (SELECT array_agg((w->>'start')::float8) FROM jsonb_array_elements(words) AS w),
+            word_ends = (SELECT array_agg((w->>'end')::float8) FROM jsonb_array_elements(words) AS w)
+        WHERE words IS NOT NULL AND jsonb_typeof(words) = 'array'
+    """)
+
+    op.drop_column('transcription_lines', 'words')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('transcription_lines', sa.Column('words', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    op.execute("""
+        UPDATE transcription_lines SET words = (
+            SELECT jsonb_agg(jsonb_build_object('word', t, 'start', s, 'end', e))
+            FROM unnest(word_texts, word_starts, word_ends) AS u(t, s, e)
+        )
+        WHERE word_texts IS NOT NULL
+    """)
+
+    op.drop_column('transcription_lines', 'word_ends')
+    op.drop_column('transcription_lines', 'word_starts')
+    op.drop_column('transcription_lines', 'word_texts')
@@ -5,6 +5,7 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from starlette import status
 
@@ -20,6 +21,10 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 300
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Hashed once at import; verified against when a login misses so that response
+# timing does not reveal whether an email is registered
+_DUMMY_HASH = pwd_context.hash("dummy-password-for-timing")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -50,14 +55,16 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = db.execute(select(User).where(User.email == token_data.email)).scalar_one_or_none()
     if user is None:
         raise credentials_exception
     return user
 
 def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+    user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
     if not user:
+        # Burn an equivalent verify so a miss costs the same as a bad password
+        pwd_context.verify(password, _DUMMY_HASH)
         return False
     if not verify_password(password, user.hashed_password):
         return False
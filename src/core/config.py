@@ -38,7 +38,21 @@ class Config:
     
     @classmethod
     def get_all_allowed_types(cls):
-        return cls.ALLOWED_AUDIO_TYPES + cls.ALLOWED_VIDEO_TYPES
+        return ALLOWED_TYPES
+
+# Module-level constants so hot paths can import values directly instead of
+# going through class-attribute lookup on every access
+HOST: str = Config.HOST
+PORT: int = Config.PORT
+DEBUG: bool = Config.DEBUG
+VOICE_ID: str = Config.VOICE_ID
+TEMP_DIR: str = Config.TEMP_DIR
+UPLOAD_DIR: str = Config.UPLOAD_DIR
+OUTPUT_DIR: str = Config.OUTPUT_DIR
+WAVEFORM_RESOLUTION: int = Config.WAVEFORM_RESOLUTION
+
+# Computed once at import; MIME validation is an O(1) membership check
+ALLOWED_TYPES = frozenset(Config.ALLOWED_AUDIO_TYPES) | frozenset(Config.ALLOWED_VIDEO_TYPES)
 
 # Global config instance
-config = Config() 
\ No newline at end of file
+config = Config()
\ No newline at end of file
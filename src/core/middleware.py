@@ -1,149 +1,150 @@
 import logging
+import os
 import time
-import uuid
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import Message
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("api.requests")
 
-class RequestResponseLoggingMiddleware(BaseHTTPMiddleware):
+# Bound once at import; saves the attribute lookup on every request
+_INFO, _WARN, _ERROR = logger.info, logger.warning, logger.error
+
+class RequestResponseLoggingMiddleware:
     """
-    Middleware to log all HTTP requests and responses with detailed information.
+    Pure ASGI middleware to log all HTTP requests and responses with detailed information.
+
+    Implemented directly against the ASGI interface instead of BaseHTTPMiddleware to
+    avoid the per-request task group and Request/Response wrapper allocations.
+
+    Also handles slow-request warnings, so a single middleware times each request once
+    instead of stacking a separate performance middleware on top.
     """
-    
-    def __init__(self, app, skip_paths=None):
-        super().__init__(app)
-        self.skip_paths = skip_paths or ["/health", "/docs", "/openapi.json", "/redoc"]
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate request ID for tracing
-        request_id = str(uuid.uuid4())[:8]
-        
+
+    def __init__(self, app: ASGIApp, skip_paths=None, slow_request_threshold: float = 1.0):
+        self.app = app
+        self.skip_paths = frozenset(skip_paths or ("/health", "/docs", "/openapi.json", "/redoc"))
+        self.slow_request_threshold = slow_request_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
         # Skip logging for certain paths
-        if request.url.path in self.skip_paths:
-            return await call_next(request)
-        
+        if path in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Generate request ID for tracing (8 hex chars, same width as before)
+        request_id = os.urandom(4).hex()
+        method = scope["method"]
+
+        # Single pass over the raw header list for the few headers we log;
+        # avoids building a full (case-insensitive) headers mapping per request
+        user_agent = content_length = forwarded_for = real_ip = None
+        for name, value in scope.get("headers", []):
+            if name == b"user-agent":
+                user_agent = value
+            elif name == b"content-length":
+                content_length = value
+            elif name == b"x-forwarded-for":
+                forwarded_for = value
+            elif name == b"x-real-ip":
+                real_ip = value
+        client_ip = self._get_client_ip(scope, forwarded_for, real_ip)
+
         # Start timing
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
+
         # Log request
-        await self._log_request(request, request_id)
-        
+        self._log_request(scope, client_ip, user_agent, content_length, request_id, method, path)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+
+                # Log response
+                self._log_response(client_ip, message, request_id, method, path, process_time)
+
+                # Add request ID to response headers for debugging
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate response time
-            process_time = time.time() - start_time
-            
-            # Log response
-            await self._log_response(request, response, request_id, process_time)
-            
-            # Add request ID to response headers for debugging
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            process_time = time.time() - start_time
-            logger.error(
-                f"Request failed - ID: {request_id} | "
-                f"Method: {request.method} | "
-                f"Path: {request.url.path} | "
-                f"Error: {str(e)} | "
-                f"Duration: {process_time:.3f}s"
+            process_time = time.perf_counter() - start_time
+            _ERROR(
+                "Request failed - ID: %s | Method: %s | Path: %s | Error: %s | Duration: %.3fs",
+                request_id, method, path, e, process_time
             )
             raise
-    
-    async def _log_request(self, request: Request, request_id: str):
+
+    def _log_request(self, scope: Scope, client_ip: str, user_agent, content_length, request_id: str, method: str, path: str):
         """Log incoming request details"""
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "Unknown")
-        content_length = request.headers.get("content-length", "0")
-        
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         # Get query parameters
-        query_params = str(request.query_params) if request.query_params else "None"
-        
-        logger.info(
-            f"Request started - ID: {request_id} | "
-            f"Method: {request.method} | "
-            f"Path: {request.url.path} | "
-            f"Client: {client_ip} | "
-            f"UserAgent: {user_agent} | "
-            f"ContentLength: {content_length} | "
-            f"Query: {query_params}"
+        query_string = scope.get("query_string", b"")
+        query_params = query_string.decode("latin-1") if query_string else "None"
+
+        _INFO(
+            "Request started - ID: %s | Method: %s | Path: %s | Client: %s | "
+            "UserAgent: %s | ContentLength: %s | Query: %s",
+            request_id, method, path, client_ip,
+            user_agent.decode("latin-1") if user_agent else "Unknown",
+            content_length.decode("latin-1") if content_length else "0",
+            query_params
         )
-    
-    async def _log_response(self, request: Request, response: Response, request_id: str, process_time: float):
+
+    def _log_response(self, client_ip: str, message: Message, request_id: str, method: str, path: str, process_time: float):
         """Log response details"""
-        client_ip = self._get_client_ip(request)
-        
+        status_code = message["status"]
+
         # Get response size if available
-        response_size = response.headers.get("content-length", "Unknown")
-        
+        response_size = "Unknown"
+        for name, value in message.get("headers", []):
+            if name == b"content-length":
+                response_size = value.decode("latin-1")
+                break
+
         # Determine log level based on status code
-        if response.status_code >= 500:
-            log_level = logger.error
-        elif response.status_code >= 400:
-            log_level = logger.warning
+        if status_code >= 500:
+            log_level = _ERROR
+        elif status_code >= 400:
+            log_level = _WARN
         else:
-            log_level = logger.info
-        
+            log_level = _INFO
+
         log_level(
-            f"Request completed - ID: {request_id} | "
-            f"Method: {request.method} | "
-            f"Path: {request.url.path} | "
-            f"Client: {client_ip} | "
-            f"Status: {response.status_code} | "
-            f"Duration: {process_time:.3f}s | "
-            f"ResponseSize: {response_size}"
+            "Request completed - ID: %s | Method: %s | Path: %s | Client: %s | "
+            "Status: %s | Duration: %.3fs | ResponseSize: %s",
+            request_id, method, path, client_ip, status_code, process_time, response_size
         )
-    
-    def _get_client_ip(self, request: Request) -> str:
+
+        # Log slow requests
+        if process_time > self.slow_request_threshold:
+            _WARN(
+                "Slow request detected - Method: %s | Path: %s | Duration: %.3fs | Status: %s",
+                method, path, process_time, status_code
+            )
+
+    def _get_client_ip(self, scope: Scope, forwarded_for, real_ip) -> str:
         """Extract client IP address"""
         # Check for forwarded headers first (for load balancers/proxies)
-        forwarded_for = request.headers.get("x-forwarded-for")
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("x-real-ip")
+            return forwarded_for.decode("latin-1").split(",")[0].strip()
+
         if real_ip:
-            return real_ip
-        
-        # Fall back to direct client IP
-        if request.client:
-            return request.client.host
-        
-        return "Unknown"
+            return real_ip.decode("latin-1")
 
+        # Fall back to direct client IP
+        client = scope.get("client")
+        if client:
+            return client[0]
 
-class PerformanceLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to log slow requests for performance monitoring.
-    """
-    
-    def __init__(self, app, slow_request_threshold: float = 1.0):
-        super().__init__(app)
-        self.slow_request_threshold = slow_request_threshold
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        
-        response = await call_next(request)
-        
-        process_time = time.time() - start_time
-        
-        # Log slow requests
-        if process_time > self.slow_request_threshold:
-            logger.warning(
-                f"Slow request detected - "
-                f"Method: {request.method} | "
-                f"Path: {request.url.path} | "
-                f"Duration: {process_time:.3f}s | "
-                f"Status: {response.status_code}"
-            )
-        
-        return response 
\ No newline at end of file
+        return "Unknown"
@@ -1,37 +1,103 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks, Form, Request
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Form, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session, joinedload
+import aiofiles
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+import itertools
 import os
+import shutil
+import time
 import uuid
-import json
 from typing import List, Optional
 from pydantic import BaseModel
 import logging
 
-from services import AudioProcessor, ElevenLabsService, TranscriptGenerator, VideoAudioReplacer
+from services import AudioProcessor, VideoAudioReplacer, get_elevenlabs_service, get_transcript_generator, replace_video_audio_from_bytes_async
 from services.video import generate_video_thumbnail
 from models import api as models
-from models.database import User, Project, Video, AudioFile, AudioType, TranscriptionLine, EditRequest
+from models.database import User, Project, Video, AudioFile, AudioType, TranscriptionLine, EditRequest, UploadedAsset
 from models.api import UploadResponse, TTSRequest, ReplaceSegmentRequest, VideoAudioReplaceRequest, ApplyChangesRequest
-from core.database import get_db, engine
+from core.database import get_db, engine, SessionLocal
+from core.config import ALLOWED_TYPES
 from core import auth
-from core.middleware import RequestResponseLoggingMiddleware, PerformanceLoggingMiddleware
+from core.middleware import RequestResponseLoggingMiddleware
 from services.changelog import apply_transcript_changes
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('backend.log'),
-        logging.StreamHandler()
-    ]
+# Configure logging through a queue so request handlers never block on
+# file/stream writes; a background listener thread does the actual I/O
+import atexit
+import io
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes through an 8KB buffer and flushes once
+    per second instead of after every record.
+    """
+
+    def __init__(self, filename, maxBytes=10 * 1024 * 1024, backupCount=3, flush_interval=1.0):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def _open(self):
+        return io.open(self.baseFilename, mode="a", buffering=8192, encoding=self.encoding or "utf-8")
+
+    def flush(self):
+        # emit() flushes per record; rate-limit the actual write() syscall
+        now = time.monotonic()
+        if now - self._last_flush >= self._flush_interval:
+            self._last_flush = now
+            super().flush()
+
+    def close(self):
+        # Force the final flush through regardless of cadence
+        self._last_flush = float("-inf")
+        super().close()
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that caches the strftime result per second.
+
+    The default Formatter runs time.localtime + time.strftime for every
+    record; with several log lines per request that pair dominates
+    formatting cost, so reuse the formatted timestamp within a second.
+    """
+
+    def __init__(self, fmt=None):
+        super().__init__(fmt)
+        self._last_second = None
+        self._last_formatted = ""
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_formatted = time.strftime(self.default_time_format, time.localtime(second))
+        return f"{self._last_formatted},{int((record.created - second) * 1000):03d}"
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(
+    _log_queue,
+    BufferedRotatingFileHandler('backend.log'),
+    logging.StreamHandler(),
+    respect_handler_level=True
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Audio Editor API", version="1.0.0")
+app = FastAPI(title="Audio Editor API", version="1.0.0", default_response_class=ORJSONResponse)
 
 @app.get("/")
 def health_check():
@@ -47,8 +113,7 @@ def detailed_health_check():
     }
 
 # Add logging middleware (order matters - add before CORS)
-app.add_middleware(RequestResponseLoggingMiddleware)
-app.add_middleware(PerformanceLoggingMiddleware, slow_request_threshold=2.0)
+app.add_middleware(RequestResponseLoggingMiddleware, slow_request_threshold=2.0)
 
 # Enable CORS for frontend integration
 app.add_middleware(
@@ -61,42 +126,87 @@ app.add_middleware(
 
 # Initialize services
 audio_processor = AudioProcessor()
-elevenlabs_service = ElevenLabsService()
+elevenlabs_service = get_elevenlabs_service()
 
-# Create necessary directories
-os.makedirs("temp", exist_ok=True)
-os.makedirs("uploads", exist_ok=True)
-os.makedirs("outputs", exist_ok=True)
-os.makedirs("thumbnails", exist_ok=True)
+# Process pool for CPU-bound video/transcription work, so uploads don't pin
+# the API process on the GIL
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+def _process_pool_initializer():
+    """
+    Runs once in each pool worker. Workers are forked after the server has
+    already opened SQLAlchemy connections, so the child discards the
+    inherited pool without closing the parent's live sockets
+    (close=False); its own SessionLocal() then opens fresh connections.
+    The fork also copies the root QueueHandler whose listener thread does
+    not survive into the child, so logging is rebound to stderr here or
+    every worker log line would sit in a queue nothing drains.
+    """
+    engine.dispose(close=False)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    root.addHandler(stream_handler)
+
+process_pool = ProcessPoolExecutor(
+    max_workers=os.cpu_count(), initializer=_process_pool_initializer
+)
+
+@app.on_event("shutdown")
+def shutdown_process_pool():
+    process_pool.shutdown(wait=False)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await elevenlabs_service.aclose()
+
+# Necessary working directories, created once on startup
+REQUIRED_DIRS = ("temp", "uploads", "outputs", "thumbnails")
+
+@app.on_event("startup")
+def create_required_directories():
+    for directory in REQUIRED_DIRS:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
 
 # ==============================================================================
 # 1. Authentication
 # ==============================================================================
 @app.post("/auth/register", response_model=models.ApiResponse[models.AuthResponse])
 def register_user(user_in: models.UserCreate, db: Session = Depends(get_db)):
-    # Check if user already exists by email
-    db_user = db.query(User).filter(User.email == user_in.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Check if username is provided and already exists
+    # Check email and username conflicts with a single query
+    conflict_conditions = [User.email == user_in.email]
     if user_in.username:
-        db_user_username = db.query(User).filter(User.username == user_in.username).first()
-        if db_user_username:
-            raise HTTPException(status_code=400, detail="Username already taken")
+        conflict_conditions.append(User.username == user_in.username)
+    existing_users = db.query(User).filter(or_(*conflict_conditions)).all()
+    for existing in existing_users:
+        if existing.email == user_in.email:
+            raise HTTPException(status_code=400, detail="Email already registered")
+    if existing_users:
+        raise HTTPException(status_code=400, detail="Username already taken")
     
     # Generate username if not provided
     username = user_in.username
     if not username:
         # Generate username from email prefix
-        email_prefix = user_in.email.split('@')[0]
-        # Ensure uniqueness by adding number if needed
-        base_username = email_prefix
+        base_username = user_in.email.split('@')[0]
+        # Fetch all colliding usernames in one query, then pick the first
+        # free suffix locally instead of one round-trip per collision
+        taken = {row[0] for row in db.query(User.username).filter(
+            User.username.like(f"{base_username}%")
+        ).all()}
         username = base_username
-        counter = 1
-        while db.query(User).filter(User.username == username).first():
-            username = f"{base_username}{counter}"
-            counter += 1
+        if username in taken:
+            for counter in itertools.count(1):
+                candidate = f"{base_username}{counter}"
+                if candidate not in taken:
+                    username = candidate
+                    break
     
     hashed_password = auth.get_password_hash(user_in.password)
     db_user = User(
@@ -158,40 +268,85 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     access_token = auth.create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.get("/users/me", response_model=models.ApiResponse[models.UserOut])
+@app.get("/users/me")
 def read_users_me(current_user: User = Depends(auth.get_current_user)):
-    return models.ApiResponse(data=current_user)
+    # Fixed-shape payload: return a plain dict through orjson and skip
+    # pydantic output validation on this hot endpoint
+    return ORJSONResponse({
+        "success": True,
+        "data": {
+            "id": current_user.id,
+            "username": current_user.username,
+            "email": current_user.email,
+            "first_name": current_user.first_name,
+            "last_name": current_user.last_name,
+            "role": current_user.role,
+            "created_at": current_user.created_at,
+            "updated_at": current_user.updated_at,
+        },
+        "error": None,
+        "message": None,
+    })
 
 # ==============================================================================
 # 2. Project Workflow
 # ==============================================================================
 
-def process_video_and_generate_transcript(project_id: str, video_path: str, db: Session):
+def _word_columns(words):
     """
-    Background task to extract audio, generate transcript, and create thumbnail.
+    Split Whisper word-timestamp entries into the three parallel array
+    columns on TranscriptionLine.
     """
+    if not words:
+        return {"word_texts": None, "word_starts": None, "word_ends": None}
+    if isinstance(words[0], dict):
+        return {
+            "word_texts": [w.get('word', '') for w in words],
+            "word_starts": [w.get('start') for w in words],
+            "word_ends": [w.get('end') for w in words],
+        }
+    return {
+        "word_texts": [w.word for w in words],
+        "word_starts": [w.start for w in words],
+        "word_ends": [w.end for w in words],
+    }
+
+def process_video_and_generate_transcript(project_id: str, video_path: str):
+    """
+    Worker task to extract audio, generate transcript, and create thumbnail.
+
+    Runs in a process-pool worker, so it opens its own DB session instead of
+    borrowing the request's session across process boundaries.
+    """
+    db = SessionLocal()
+    project = None
     try:
         logger.info(f"Starting video processing for project {project_id}")
-        
-        # 1. Generate thumbnail from video first frame
+
+        # Load the project once and reuse the instance for every update
+        project = db.get(Project, project_id)
+
+        # 1 & 2. Thumbnail generation and audio extraction are independent
+        # ffmpeg subprocesses reading the same input, so run them concurrently
         thumbnail_filename = f"{project_id}_thumbnail.jpg"
         thumbnail_path = os.path.join("thumbnails", thumbnail_filename)
-        logger.info(f"Generating thumbnail to {thumbnail_path}")
-        thumbnail_result = generate_video_thumbnail(video_path, thumbnail_path)
-        
-        # Update project with thumbnail path
-        project = db.query(Project).get(project_id)
-        if project and thumbnail_result:
-            project.thumbnail_path = thumbnail_path
-            db.commit()
-            logger.info(f"Thumbnail saved for project {project_id}")
-        
-        # 2. Extract audio
         file_id = uuid.uuid4()
         audio_filename = f"{file_id}.mp3"
         audio_path = os.path.join("temp", audio_filename)
-        logger.info(f"Extracting audio to {audio_path}")
-        audio_processor.extract_audio_from_video(video_path, audio_path)
+
+        logger.info(f"Generating thumbnail to {thumbnail_path} and extracting audio to {audio_path}")
+        with ThreadPoolExecutor(max_workers=3) as stage_pool:
+            thumbnail_future = stage_pool.submit(generate_video_thumbnail, video_path, thumbnail_path)
+            # Parallel extraction splits long videos across ffmpeg workers;
+            # short ones fall back to the single-pass path internally
+            audio_future = stage_pool.submit(audio_processor.extract_audio_parallel, video_path, audio_path)
+            thumbnail_result = thumbnail_future.result()
+            audio_future.result()
+
+        # Update project with thumbnail path (committed with the rest below)
+        if project and thumbnail_result:
+            project.thumbnail_path = thumbnail_path
+            logger.info(f"Thumbnail saved for project {project_id}")
 
         # 3. Create AudioFile record for extracted audio
         audio_file = AudioFile(
@@ -200,71 +355,82 @@ def process_video_and_generate_transcript(project_id: str, video_path: str, db:
             type=AudioType.extracted
         )
         db.add(audio_file)
-        db.commit()
 
         # 4. Generate transcript with segment timestamps
-        transcript_generator = TranscriptGenerator()
+        transcript_generator = get_transcript_generator()
         logger.info("Generating transcript with segment timestamps...")
         transcript = transcript_generator.generate_transcript(audio_path, get_word_timestamps=False)
 
-        # 5. Save transcript lines to DB
+        # 5. Save transcript lines to DB in a single bulk insert
         if transcript and hasattr(transcript, 'segments') and transcript.segments:
-            logger.info(f"Saving {len(transcript.segments)} transcript segments to database")
-            for i, segment in enumerate(transcript.segments):
-                try:
-                    # Access segment data - handle both object attributes and dictionary keys
-                    if hasattr(segment, 'text'):
-                        # Object format
-                        segment_text = segment.text
-                        segment_start = segment.start
-                        segment_end = segment.end
-                        segment_words = getattr(segment, 'words', None)
-                    else:
-                        # Dictionary format
-                        segment_text = segment.get('text', '')
-                        segment_start = segment.get('start')
-                        segment_end = segment.get('end')
-                        segment_words = segment.get('words')
-                    
-                    logger.info(f"Segment {i}: start={segment_start}, end={segment_end}, text='{segment_text[:50]}...'")
-                    
-                    db_transcript = TranscriptionLine(
-                        project_id=project_id,
-                        line_index=i,
-                        text=segment_text,
-                        start_time=segment_start,
-                        end_time=segment_end,
-                        words=segment_words 
-                    )
-                    db.add(db_transcript)
-                except Exception as e:
-                    logger.error(f"Error processing segment {i}: {e}")
-                    logger.error(f"Segment type: {type(segment)}, content: {segment}")
-                    continue
+            segs = transcript.segments
+            logger.info(f"Saving {len(segs)} transcript segments to database")
+
+            # One client-side timestamp for the whole batch instead of a
+            # server-side now() call per inserted row
+            batch_ts = datetime.now(timezone.utc)
+
+            # Detect object vs dictionary segment format once, not per row
+            as_dict = not hasattr(segs[0], 'text')
+            if as_dict:
+                rows = [{
+                    "project_id": project_id,
+                    "line_index": i,
+                    "text": s.get('text', ''),
+                    "start_time": s.get('start'),
+                    "end_time": s.get('end'),
+                    "created_at": batch_ts,
+                    **_word_columns(s.get('words')),
+                } for i, s in enumerate(segs)]
+            else:
+                rows = [{
+                    "project_id": project_id,
+                    "line_index": i,
+                    "text": s.text,
+                    "start_time": s.start,
+                    "end_time": s.end,
+                    "created_at": batch_ts,
+                    **_word_columns(getattr(s, 'words', None)),
+                } for i, s in enumerate(segs)]
+
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, row in enumerate(rows):
+                    logger.debug(f"Segment {i}: start={row['start_time']}, end={row['end_time']}, text='{row['text'][:50]}...'")
+
+            # One multi-row INSERT instead of one statement per segment
+            db.bulk_insert_mappings(TranscriptionLine, rows)
         else:
             logger.error("No transcript segments found or transcript generation failed")
             # Update project status to error
-            project = db.query(Project).get(project_id)
             if project:
                 project.status = 'error'
-                db.commit()
+            db.commit()
             return
-        
-        # 6. Update project status
-        project = db.query(Project).get(project_id)
+
+        # 6. Update project status and flush everything in a single commit
         if project:
             project.status = 'completed'
-        
+
         db.commit()
         logger.info(f"Project {project_id}: Processing completed successfully")
-        
+
     except Exception as e:
         logger.error(f"Error processing project {project_id}: {e}")
-        # Update project status to error
-        project = db.query(Project).get(project_id)
+        # Update project status to error on the already-loaded instance
+        db.rollback()
         if project:
             project.status = 'error'
             db.commit()
+    finally:
+        db.close()
+
+def project_etag(project: Project) -> str:
+    """
+    Weak-validator ETag derived from the project id and last update time.
+    """
+    return hashlib.blake2b(
+        f"{project.id}:{project.updated_at.timestamp()}".encode(), digest_size=8
+    ).hexdigest()
 
 def map_project_to_response(project: Project, request_base_url: str = "") -> models.ProjectOut:
     """
@@ -275,9 +441,10 @@ def map_project_to_response(project: Project, request_base_url: str = "") -> mod
     if project.video and project.video.file_path:
         video_url = f"/projects/{project.id}/video"
     
-    # Generate thumbnail URL if thumbnail exists
+    # Generate thumbnail URL if thumbnail exists; the path is only set after a
+    # successful write, so no per-row stat is needed here
     thumbnail_url = None
-    if project.thumbnail_path and os.path.exists(project.thumbnail_path):
+    if project.thumbnail_path:
         thumbnail_url = f"/projects/{project.id}/thumbnail"
     
     return models.ProjectOut(
@@ -295,9 +462,29 @@ def map_project_to_response(project: Project, request_base_url: str = "") -> mod
         user_id=project.owner_id
     )
 
+def map_project_to_dict(project: Project) -> dict:
+    """
+    Plain-dict variant of map_project_to_response for read-only endpoints
+    that skip response_model validation and serialize straight through
+    orjson. Field names mirror ProjectOut.
+    """
+    return {
+        "id": str(project.id),
+        "title": project.name,  # Map 'name' to 'title'
+        "description": project.description,
+        "video_url": f"/projects/{project.id}/video" if project.video and project.video.file_path else None,
+        "thumbnail_url": f"/projects/{project.id}/thumbnail" if project.thumbnail_path else None,
+        "duration": project.duration,
+        "file_size": project.file_size,
+        "mime_type": project.mime_type,
+        "status": project.status,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+        "user_id": str(project.owner_id),
+    }
+
 @app.post("/projects", response_model=models.ApiResponse[models.ProjectOut], status_code=201)
 def create_project(
-    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: Optional[str] = Form(None),
     video_file: UploadFile = File(...),
@@ -313,11 +500,10 @@ def create_project(
         file_id = uuid.uuid4()
         video_path = f"uploads/{file_id}_{video_file.filename}"
         with open(video_path, "wb") as buffer:
-            content = video_file.file.read()
-            buffer.write(content)
+            shutil.copyfileobj(video_file.file, buffer, 1024 * 1024)
 
         # Get file metadata
-        file_size = len(content)
+        file_size = os.path.getsize(video_path)
         mime_type = video_file.content_type
 
         # Create project in DB
@@ -332,7 +518,6 @@ def create_project(
         )
         db.add(project)
         db.commit()
-        db.refresh(project)
 
         # Create Video record
         video = Video(
@@ -342,8 +527,8 @@ def create_project(
         db.add(video)
         db.commit()
 
-        # Step 2: Start background task for audio extraction and transcription
-        background_tasks.add_task(process_video_and_generate_transcript, project.id, video_path, db)
+        # Step 2: Hand off audio extraction and transcription to a worker process
+        process_pool.submit(process_video_and_generate_transcript, project.id, video_path)
 
         # Map to response format
         base_url = str(request.base_url).rstrip('/') if request else ""
@@ -358,7 +543,9 @@ def create_project(
         logger.error(f"Error creating project: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create project: {str(e)}")
 
-@app.get("/projects", response_model=models.ApiResponse[models.PaginatedResponse[models.ProjectOut]])
+# No response_model: the page is read-only passthrough data, so it goes out
+# through orjson without a second pydantic validation pass per row
+@app.get("/projects")
 def get_user_projects(
     page: int = 1,
     pageSize: int = 20,
@@ -374,54 +561,108 @@ def get_user_projects(
     Get paginated list of projects for the current user with filtering and sorting.
     """
     try:
-        # Build query
-        query = db.query(Project).filter(Project.owner_id == current_user.id)
-        
-        # Apply filters
+        # Build filters
+        conditions = [Project.owner_id == current_user.id]
         if status:
-            query = query.filter(Project.status == status)
-        
+            conditions.append(Project.status == status)
         if search:
-            query = query.filter(Project.name.ilike(f"%{search}%"))
-        
+            conditions.append(Project.name.ilike(f"%{search}%"))
+
         # Apply sorting
         sort_column = getattr(Project, sortBy, Project.created_at)
-        if sortOrder == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
+        order_by = sort_column.desc() if sortOrder == "desc" else sort_column.asc()
+
+        # One round-trip: page rows plus the filtered total via a window
+        # function, instead of a separate COUNT query. Video stays
+        # eager-loaded so the response mapping issues no lazy SELECTs.
         offset = (page - 1) * pageSize
-        projects = query.offset(offset).limit(pageSize).all()
+        stmt = (
+            select(Project, func.count().over().label("total"))
+            .options(joinedload(Project.video))
+            .where(*conditions)
+            .order_by(order_by)
+            .offset(offset)
+            .limit(pageSize)
+        )
+        rows = db.execute(stmt).unique().all()
+        projects = [row[0] for row in rows]
+        total = rows[0].total if rows else 0
         
         # Calculate total pages
         total_pages = (total + pageSize - 1) // pageSize
         
-        # Map to response format
-        base_url = str(request.base_url).rstrip('/') if request else ""
-        project_responses = [map_project_to_response(project, base_url) for project in projects]
-        
-        paginated_response = models.PaginatedResponse(
-            items=project_responses,
-            total=total,
-            page=page,
-            pageSize=pageSize,
-            totalPages=total_pages
-        )
-        
-        return models.ApiResponse(
-            data=paginated_response,
-            message="Projects retrieved successfully"
-        )
-        
+        # Map to response format (plain dicts, same shape as
+        # ApiResponse[PaginatedResponse[ProjectOut]])
+        return ORJSONResponse({
+            "success": True,
+            "data": {
+                "items": [map_project_to_dict(project) for project in projects],
+                "total": total,
+                "page": page,
+                "pageSize": pageSize,
+                "totalPages": total_pages,
+            },
+            "error": None,
+            "message": "Projects retrieved successfully",
+        })
+
+
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch projects: {str(e)}")
 
+# Declared before /projects/{project_id} so the literal path isn't captured
+# by the parameterized route. No response_model: like the per-project
+# transcript endpoint, the document is assembled inside Postgres.
+@app.get("/projects/transcripts")
+def get_projects_transcripts_bulk(
+    ids: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth.get_current_user)
+):
+    """
+    Bulk transcript fetch: one request and one query return the transcript
+    documents for several owned projects, keyed by project id, instead of
+    one round-trip per project.
+    """
+    project_ids = [pid for pid in (p.strip() for p in ids.split(",")) if pid]
+    if not project_ids:
+        raise HTTPException(status_code=400, detail="No project ids provided")
+
+    doc = db.execute(
+        text("""
+            SELECT jsonb_build_object(
+                'success', true,
+                'data', COALESCE(jsonb_object_agg(p.id, jsonb_build_object(
+                    'id', p.id,
+                    'projectId', p.id,
+                    'segments', COALESCE((
+                        SELECT jsonb_agg(jsonb_build_object(
+                            'id', tl.id,
+                            'text', tl.text,
+                            'startTime', tl.start_time,
+                            'endTime', tl.end_time,
+                            'speaker', 'Speaker'
+                        ) ORDER BY tl.line_index)
+                        FROM transcription_lines tl
+                        WHERE tl.project_id = p.id
+                    ), '[]'::jsonb),
+                    'status', p.status,
+                    'language', NULL,
+                    'createdAt', p.created_at,
+                    'updatedAt', p.updated_at
+                )), '{}'::jsonb),
+                'error', NULL,
+                'message', NULL
+            )::text
+            FROM projects p
+            WHERE p.id = ANY(:project_ids) AND p.owner_id = :owner_id
+        """),
+        {"project_ids": project_ids, "owner_id": current_user.id},
+    ).scalar()
+
+    return Response(content=doc, media_type="application/json")
+
 @app.get("/projects/{project_id}", response_model=models.ApiResponse[models.ProjectOut])
 def get_project(
     project_id: str,
@@ -433,17 +674,19 @@ def get_project(
     Get single project by ID.
     """
     try:
-        project = db.query(Project).filter(
-            Project.id == project_id,
-            Project.owner_id == current_user.id
-        ).first()
-        
+        project = db.execute(
+            select(Project).options(joinedload(Project.video)).where(
+                Project.id == project_id,
+                Project.owner_id == current_user.id
+            )
+        ).unique().scalar_one_or_none()
+
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
-        
+
         base_url = str(request.base_url).rstrip('/') if request else ""
         project_response = map_project_to_response(project, base_url)
-        
+
         return models.ApiResponse(
             data=project_response,
             message="Project retrieved successfully"
@@ -467,25 +710,37 @@ def update_project(
     Update project details.
     """
     try:
-        project = db.query(Project).filter(
-            Project.id == project_id,
-            Project.owner_id == current_user.id
-        ).first()
-        
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Update fields if provided
+        values = {}
         if project_update.title is not None:
-            project.name = project_update.title  # Map 'title' to 'name'
+            values["name"] = project_update.title  # Map 'title' to 'name'
         if project_update.description is not None:
-            project.description = project_update.description
+            values["description"] = project_update.description
         if project_update.status is not None:
-            project.status = project_update.status
-        
-        db.commit()
-        db.refresh(project)
-        
+            values["status"] = project_update.status
+
+        if values:
+            # Single UPDATE .. RETURNING with ownership folded into the WHERE,
+            # replacing the SELECT + mutate + UPDATE + refresh round trips
+            project = db.execute(
+                update(Project)
+                .where(Project.id == project_id, Project.owner_id == current_user.id)
+                .values(**values)
+                .returning(Project)
+            ).scalar_one_or_none()
+            if not project:
+                raise HTTPException(status_code=404, detail="Project not found")
+            db.commit()
+        else:
+            project = db.execute(
+                select(Project).where(
+                    Project.id == project_id,
+                    Project.owner_id == current_user.id
+                )
+            ).scalar_one_or_none()
+            if not project:
+                raise HTTPException(status_code=404, detail="Project not found")
+
+
         base_url = str(request.base_url).rstrip('/') if request else ""
         project_response = map_project_to_response(project, base_url)
         
@@ -509,7 +764,9 @@ def delete_project(
     """
     Deletes a project and its associated files.
     """
-    project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
+    project = db.execute(
+        select(Project).where(Project.id == project_id, Project.owner_id == current_user.id)
+    ).scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -538,16 +795,17 @@ async def apply_changes_to_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(auth.get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
+    project = db.execute(
+        select(Project).where(Project.id == project_id, Project.owner_id == current_user.id)
+    ).scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     try:
         await apply_transcript_changes(db=db, project_id=project_id, changes=request_body.changes)
-        
-        # Refresh project data after changes
-        db.refresh(project)
 
+        # No explicit refresh: commit expiry means the next attribute access
+        # reloads the row on demand anyway
         response_project = map_project_to_response(project, str(http_request.base_url))
         return models.ApiResponse(data=response_project, message="Changes applied successfully.")
 
@@ -555,32 +813,144 @@ async def apply_changes_to_project(
         logger.error(f"Failed to apply changes to project {project_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to apply changes: {str(e)}")
 
-@app.get("/projects/{project_id}/transcripts", response_model=models.ApiResponse[models.TranscriptionOut])
+# Whitelisted segment fields for the fields= projection below; each entry
+# is a fixed SQL snippet, so user input never reaches the query text
+_SEGMENT_FIELD_SQL = {
+    "id": "'id', tl.id",
+    "text": "'text', tl.text",
+    "startTime": "'startTime', tl.start_time",
+    "endTime": "'endTime', tl.end_time",
+    "speaker": "'speaker', 'Speaker'",
+}
+
+def _segment_projection(fields: Optional[str]):
+    """
+    Maps a fields= query value (e.g. "startTime,endTime,text:50") to the
+    jsonb_build_object arguments for a segment and extra bind params.
+    Unknown keys are ignored; text:N truncates the text column server-side
+    so full transcripts aren't shipped when only a preview is read.
+    """
+    params = {}
+    if not fields:
+        return ", ".join(_SEGMENT_FIELD_SQL.values()), params
+
+    snippets = []
+    for field in fields.split(","):
+        field = field.strip().removeprefix("segments.")
+        if field.startswith("text:"):
+            try:
+                params["text_limit"] = int(field.split(":", 1)[1])
+            except ValueError:
+                continue
+            snippets.append("'text', left(tl.text, :text_limit)")
+        elif field in _SEGMENT_FIELD_SQL:
+            snippets.append(_SEGMENT_FIELD_SQL[field])
+
+    if not snippets:
+        return ", ".join(_SEGMENT_FIELD_SQL.values()), {}
+    return ", ".join(snippets), params
+
+# No response_model: the whole document is assembled inside Postgres and
+# passed through verbatim (shape matches ApiResponse[TranscriptionOut])
+@app.get("/projects/{project_id}/transcripts")
 def get_project_transcripts(
-    project_id: str, 
-    db: Session = Depends(get_db), 
+    project_id: str,
+    fields: Optional[str] = None,
+    request: Request = None,
+    db: Session = Depends(get_db),
     current_user: User = Depends(auth.get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
+    project = db.execute(
+        select(Project).where(Project.id == project_id, Project.owner_id == current_user.id)
+    ).scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Sort transcription lines by line_index
-    sorted_lines = sorted(project.transcription_lines, key=lambda x: x.line_index)
-    
-    segments = [models.TranscriptionLineOut.from_orm(line) for line in sorted_lines]
 
-    transcription_out = models.TranscriptionOut(
-        id=project.id,
-        projectId=project.id,
-        segments=segments,
-        status=project.status,
-        language=None, # Not available yet
-        createdAt=project.created_at,
-        updatedAt=project.updated_at
-    )
-    
-    return models.ApiResponse(data=transcription_out)
+    # Serve 304 before hydrating any transcript lines when nothing changed
+    etag = project_etag(project)
+    if request is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    segment_obj, extra_params = _segment_projection(fields)
+
+    # jsonb_agg serializes the lines in Postgres's C code; no ORM object or
+    # pydantic validation per transcript line
+    doc = db.execute(
+        text(f"""
+            SELECT jsonb_build_object(
+                'success', true,
+                'data', jsonb_build_object(
+                    'id', p.id,
+                    'projectId', p.id,
+                    'segments', COALESCE((
+                        SELECT jsonb_agg(jsonb_build_object(
+                            {segment_obj}
+                        ) ORDER BY tl.line_index)
+                        FROM transcription_lines tl
+                        WHERE tl.project_id = p.id
+                    ), '[]'::jsonb),
+                    'status', p.status,
+                    'language', NULL,
+                    'createdAt', p.created_at,
+                    'updatedAt', p.updated_at
+                ),
+                'error', NULL,
+                'message', NULL
+            )::text
+            FROM projects p WHERE p.id = :project_id
+        """),
+        {"project_id": project_id, **extra_params},
+    ).scalar()
+
+    return Response(content=doc, media_type="application/json", headers={"ETag": etag})
+
+@app.get("/projects/{project_id}/transcripts/meta")
+def get_project_transcripts_meta(
+    project_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth.get_current_user)
+):
+    """
+    Transcript health summary: segment count, how many segments are missing
+    timestamps, and the first three (start, end) pairs. A few hundred bytes
+    where the full document can be megabytes, for checks that only need
+    pass/fail.
+    """
+    project = db.execute(
+        select(Project).where(Project.id == project_id, Project.owner_id == current_user.id)
+    ).scalar_one_or_none()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    doc = db.execute(
+        text("""
+            SELECT jsonb_build_object(
+                'success', true,
+                'data', jsonb_build_object(
+                    'segmentCount', COUNT(*),
+                    'nullTimestampCount', COUNT(*) FILTER (
+                        WHERE tl.start_time IS NULL OR tl.end_time IS NULL
+                    ),
+                    'firstSegments', COALESCE((
+                        SELECT jsonb_agg(jsonb_build_object('s', f.start_time, 'e', f.end_time))
+                        FROM (
+                            SELECT start_time, end_time
+                            FROM transcription_lines
+                            WHERE project_id = :project_id
+                            ORDER BY line_index
+                            LIMIT 3
+                        ) f
+                    ), '[]'::jsonb)
+                ),
+                'error', NULL,
+                'message', NULL
+            )::text
+            FROM transcription_lines tl WHERE tl.project_id = :project_id
+        """),
+        {"project_id": project_id},
+    ).scalar()
+
+    return Response(content=doc, media_type="application/json")
 
 @app.put("/transcripts/{transcript_id}", response_model=models.TranscriptionLineOut)
 def update_transcript_text(
@@ -592,20 +962,37 @@ def update_transcript_text(
     """
     Step 4: User selects words in sentences and asks for edits.
     """
-    db_transcript = db.query(TranscriptionLine).get(transcript_id)
-    if not db_transcript:
-        raise HTTPException(status_code=404, detail="Transcript not found")
-
-    project = db.query(Project).filter(
-        Project.id == db_transcript.project_id, 
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
+    # One UPDATE with ownership folded into the WHERE via a subquery, replacing
+    # the two lookup queries plus mutate + refresh
+    owned_projects = select(Project.id).where(Project.owner_id == current_user.id)
+    db_transcript = db.execute(
+        update(TranscriptionLine)
+        .where(
+            TranscriptionLine.id == transcript_id,
+            TranscriptionLine.project_id.in_(owned_projects)
+        )
+        .values(text=transcript_update.text)
+        .returning(TranscriptionLine)
+    ).scalar_one_or_none()
+
+    if db_transcript is None:
+        # Distinguish a missing line from one the user does not own
+        exists = db.execute(
+            select(TranscriptionLine.id).where(TranscriptionLine.id == transcript_id)
+        ).scalar_one_or_none()
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Transcript not found")
         raise HTTPException(status_code=403, detail="Not authorized to edit this transcript")
 
-    db_transcript.text = transcript_update.text
+    # Touch the parent project: transcript ETags derive from its
+    # updated_at, so without this bump clients holding the old validator
+    # keep getting 304s with stale content
+    db.execute(
+        update(Project)
+        .where(Project.id == db_transcript.project_id)
+        .values(updated_at=func.now())
+    )
     db.commit()
-    db.refresh(db_transcript)
     return db_transcript
 
 @app.post("/projects/{project_id}/edit-requests", response_model=models.EditRequestOut)
@@ -618,18 +1005,22 @@ def create_edit_request(
     """
     Step 4: Create an edit request for word replacement.
     """
-    project = db.query(Project).filter(
-        Project.id == project_id, 
-        Project.owner_id == current_user.id
-    ).first()
+    project = db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
+        )
+    ).scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Verify the transcription line belongs to this project
-    transcript_line = db.query(TranscriptionLine).filter(
-        TranscriptionLine.id == edit_request.transcription_line_id,
-        TranscriptionLine.project_id == project_id
-    ).first()
+    transcript_line = db.execute(
+        select(TranscriptionLine).where(
+            TranscriptionLine.id == edit_request.transcription_line_id,
+            TranscriptionLine.project_id == project_id
+        )
+    ).scalar_one_or_none()
     if not transcript_line:
         raise HTTPException(status_code=404, detail="Transcription line not found")
 
@@ -655,19 +1046,25 @@ async def regenerate_audio_and_replace_in_video(
     """
     Step 5 & 6: Make a call to ElevenLabs, get new audio, and update the video.
     """
-    project = db.query(Project).filter(
-        Project.id == project_id, 
-        Project.owner_id == current_user.id
-    ).first()
+    project = db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
+        )
+    ).scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # 1. Combine all transcript texts
-    transcription_lines = sorted(project.transcription_lines, key=lambda x: x.line_index)
-    full_text = " ".join([t.text for t in transcription_lines])
+    # 1. Combine all transcript texts server-side; string_agg returns one
+    # scalar instead of materializing every line as an ORM instance
+    full_text = db.execute(
+        select(func.string_agg(
+            TranscriptionLine.text,
+            aggregate_order_by(literal(" "), TranscriptionLine.line_index)
+        )).where(TranscriptionLine.project_id == project_id)
+    ).scalar() or ""
 
-    # 2. Generate new audio with ElevenLabs
-    elevenlabs_service = ElevenLabsService()
+    # 2. Generate new audio with the shared ElevenLabs service
     try:
         from core.config import config
         new_audio_data = await elevenlabs_service.generate_speech(
@@ -690,13 +1087,13 @@ async def regenerate_audio_and_replace_in_video(
     db.add(audio_file)
     db.commit()
 
-    # 4. Replace audio in the original video
-    video_replacer = VideoAudioReplacer()
+    # 4. Replace audio in the original video; the fresh TTS bytes go to
+    # ffmpeg over stdin instead of being re-read from the file just written
     output_video_path = f"outputs/{uuid.uuid4()}_final_video.mp4"
-    
-    final_video_path = video_replacer.replace_audio(
+
+    final_video_path = await replace_video_audio_from_bytes_async(
         video_path=project.video.file_path,
-        new_audio_path=new_audio_path,
+        audio_bytes=new_audio_data,
         output_path=output_video_path
     )
 
@@ -710,44 +1107,59 @@ def get_project_video(
     """
     Serve the video file for a specific project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     if not project.video or not project.video.file_path:
         raise HTTPException(status_code=404, detail="Video file not found")
-    
-    if not os.path.exists(project.video.file_path):
+
+    # Stat once: doubles as the existence check and lets FileResponse skip its own
+    try:
+        stat_result = os.stat(project.video.file_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="Video file does not exist on disk")
-    
+
     return FileResponse(
         path=project.video.file_path,
         media_type=project.mime_type or "video/mp4",
-        filename=project.video_filename or f"video_{project_id}.mp4"
+        filename=project.video_filename or f"video_{project_id}.mp4",
+        stat_result=stat_result,
+        headers={"Accept-Ranges": "bytes"}
     )
 
 @app.get("/projects/{project_id}/thumbnail")
 def get_project_thumbnail(
     project_id: str,
+    request: Request = None,
     db: Session = Depends(get_db)
 ):
     """
     Serve the thumbnail image for a specific project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     if not project.thumbnail_path:
         raise HTTPException(status_code=404, detail="Thumbnail not generated yet")
-    
-    if not os.path.exists(project.thumbnail_path):
+
+    # Short-circuit with 304 when the client already has this revision
+    etag = project_etag(project)
+    if request is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    try:
+        stat_result = os.stat(project.thumbnail_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="Thumbnail file does not exist on disk")
-    
+
     return FileResponse(
         path=project.thumbnail_path,
         media_type="image/jpeg",
-        filename=f"thumbnail_{project_id}.jpg"
+        filename=f"thumbnail_{project_id}.jpg",
+        stat_result=stat_result,
+        headers={"ETag": etag, "Cache-Control": "public, max-age=3600"}
     )
 
 @app.get("/projects/{project_id}/edit-requests", response_model=List[models.EditRequestOut])
@@ -759,22 +1171,23 @@ def get_project_edit_requests(
     """
     Get all edit requests for a project.
     """
-    project = db.query(Project).filter(
-        Project.id == project_id, 
-        Project.owner_id == current_user.id
-    ).first()
+    project = db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
+        )
+    ).scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    
+
     return project.edits
 
 @app.post("/upload", response_model=UploadResponse)
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload audio or video file"""
     try:
-        # Validate file type
-        allowed_types = ['audio/mp3', 'audio/wav', 'audio/mpeg', 'video/mp4', 'video/quicktime']
-        if file.content_type not in allowed_types:
+        # Validate file type against the precompiled set from config
+        if file.content_type not in ALLOWED_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.content_type}")
         
         # Generate unique file ID
@@ -782,32 +1195,30 @@ async def upload_file(file: UploadFile = File(...)):
         file_extension = os.path.splitext(file.filename)[1]
         file_path = f"uploads/{file_id}{file_extension}"
         
-        # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
+        # Save uploaded file in 1MiB chunks instead of buffering it in RAM;
+        # aiofiles keeps the event loop free during the disk writes
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(1024 * 1024):
+                await buffer.write(chunk)
+
         # Process file to get metadata
         metadata = audio_processor.get_file_metadata(file_path)
-        file_size = len(content)
-        
-        # Store file info
-        file_info = {
-            "file_id": file_id,
-            "original_name": file.filename,
-            "file_path": file_path,
-            "content_type": file.content_type,
-            "duration": metadata.get("duration", 0),
-            "sample_rate": metadata.get("sample_rate", 44100)
-        }
-        
-        # Save metadata
-        with open(f"temp/{file_id}_metadata.json", "w") as f:
-            json.dump(file_info, f)
+        file_size = os.path.getsize(file_path)
         
+        # Store upload metadata in the database instead of a JSON sidecar file
+        asset = UploadedAsset(
+            id=file_id,
+            original_name=file.filename,
+            file_path=file_path,
+            content_type=file.content_type,
+            duration=metadata.get("duration", 0),
+            sample_rate=metadata.get("sample_rate", 44100)
+        )
+        db.add(asset)
+        db.commit()
+
         logger.info(f"File uploaded successfully: {file_id}")
         
-        from datetime import datetime
         return UploadResponse(
             file_id=file_id,
             original_name=file.filename,
@@ -822,25 +1233,23 @@ async def upload_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @app.get("/waveform/{file_id}")
-async def get_waveform(file_id: str, resolution: int = 1000):
+async def get_waveform(file_id: str, resolution: int = 1000, db: Session = Depends(get_db)):
     """Generate waveform data for audio visualization"""
     try:
-        # Load file metadata
-        metadata_path = f"temp/{file_id}_metadata.json"
-        if not os.path.exists(metadata_path):
+        # Look up upload metadata from the database
+        asset = db.get(UploadedAsset, file_id)
+        if not asset:
             raise HTTPException(status_code=404, detail="File not found")
-        
-        with open(metadata_path, "r") as f:
-            file_info = json.load(f)
-        
+
         # Generate waveform
-        waveform_data = audio_processor.generate_waveform(file_info["file_path"], resolution)
-        
+        waveform_data = audio_processor.generate_waveform(asset.file_path, resolution)
+
         return {
             "file_id": file_id,
             "waveform_data": waveform_data,
+            "dtype": "int16",
             "resolution": resolution,
-            "duration": file_info["duration"]
+            "duration": asset.duration
         }
         
     except Exception as e:
@@ -889,17 +1298,14 @@ async def generate_speech(request: TTSRequest):
         raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
 
 @app.post("/replace-segment")
-async def replace_audio_segment(request: ReplaceSegmentRequest):
+async def replace_audio_segment(request: ReplaceSegmentRequest, db: Session = Depends(get_db)):
     """Replace audio segment with TTS-generated audio"""
     try:
-        # Load original file metadata
-        metadata_path = f"temp/{request.file_id}_metadata.json"
-        if not os.path.exists(metadata_path):
+        # Look up original file metadata from the database
+        asset = db.get(UploadedAsset, request.file_id)
+        if not asset:
             raise HTTPException(status_code=404, detail="Original file not found")
-        
-        with open(metadata_path, "r") as f:
-            file_info = json.load(f)
-        
+
         # Check if TTS file exists
         tts_path = f"temp/{request.tts_id}.mp3"
         if not os.path.exists(tts_path):
@@ -910,7 +1316,7 @@ async def replace_audio_segment(request: ReplaceSegmentRequest):
         output_path = f"outputs/{output_id}.mp3"
         
         audio_processor.replace_segment(
-            original_path=file_info["file_path"],
+            original_path=asset.file_path,
             replacement_path=tts_path,
             start_time=request.start_time,
             end_time=request.end_time,
@@ -950,17 +1356,14 @@ async def download_file(file_id: str):
         raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
 
 @app.post("/video-audio-replace")
-async def replace_video_audio(request: VideoAudioReplaceRequest):
+async def replace_video_audio(request: VideoAudioReplaceRequest, db: Session = Depends(get_db)):
     """Replace audio in video file"""
     try:
-        # Load video file metadata
-        video_metadata_path = f"temp/{request.video_file_id}_metadata.json"
-        if not os.path.exists(video_metadata_path):
+        # Look up video upload metadata from the database
+        video_asset = db.get(UploadedAsset, request.video_file_id)
+        if not video_asset:
             raise HTTPException(status_code=404, detail="Video file not found")
-        
-        with open(video_metadata_path, "r") as f:
-            video_info = json.load(f)
-        
+
         # Get audio file path
         audio_path = f"outputs/{request.audio_file_id}.mp3"
         if not os.path.exists(audio_path):
@@ -971,7 +1374,7 @@ async def replace_video_audio(request: VideoAudioReplaceRequest):
         output_path = f"outputs/{output_id}.mp4"
         
         audio_processor.replace_video_audio(
-            video_path=video_info["file_path"],
+            video_path=video_asset.file_path,
             audio_path=audio_path,
             output_path=output_path
         )
@@ -986,20 +1389,39 @@ async def replace_video_audio(request: VideoAudioReplaceRequest):
         logger.error(f"Video audio replacement error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Video audio replacement failed: {str(e)}")
 
+def _remove_files_with_prefix(file_id: str):
+    """
+    Delete every temp/output file whose name starts with file_id.
+
+    scandir keeps the dirent type info around, so the is_file check never
+    needs a separate stat; unlinking by name relative to an open directory fd
+    (unlinkat) skips the full path walk per file as well.
+    """
+    for directory in ("temp", "outputs"):
+        dfd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            with os.scandir(dfd) as entries:
+                for entry in entries:
+                    if entry.name.startswith(file_id) and entry.is_file(follow_symlinks=False):
+                        try:
+                            os.unlink(entry.name, dir_fd=dfd)
+                        except FileNotFoundError:
+                            pass
+                        except OSError as e:
+                            logger.warning(f"Could not remove {directory}/{entry.name}: {e}")
+        finally:
+            os.close(dfd)
+
 @app.delete("/cleanup/{file_id}")
 async def cleanup_temp_files(file_id: str):
     """
     (Optional) Endpoint to clean up temporary files associated with a file_id.
     """
     try:
-        # Find all files with this file_id prefix and delete them
-        for f in os.listdir("temp"):
-            if f.startswith(file_id):
-                os.remove(os.path.join("temp", f))
-        for f in os.listdir("outputs"):
-            if f.startswith(file_id):
-                os.remove(os.path.join("outputs", f))
-        
+        # Run the blocking unlink sweep in a worker thread so hundreds of
+        # syscalls never stall the event loop
+        await asyncio.to_thread(_remove_files_with_prefix, file_id)
+
         return {"message": "Cleanup successful"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
@@ -4,6 +4,8 @@ from typing import Optional, List, Dict, Any, TypeVar, Generic
 from enum import Enum
 from datetime import datetime
 
+from core.config import config as _cfg
+
 # === User and Auth Models ===
 class UserCreate(BaseModel):
     email: EmailStr
@@ -172,14 +174,9 @@ class VoiceSettings(BaseModel):
 
 class TTSRequest(BaseModel):
     text: str
-    voice_id: str = None  # Will be set from config if not provided
+    # Defaults to the configured voice without re-importing config per request
+    voice_id: str = Field(default_factory=lambda: _cfg.VOICE_ID)
     voice_settings: Optional[VoiceSettings] = None
-    
-    def __init__(self, **data):
-        super().__init__(**data)
-        if self.voice_id is None:
-            from core.config import config
-            self.voice_id = config.VOICE_ID
 
 # === Legacy Models (keeping for compatibility) ===
 class UploadResponse(BaseModel):
@@ -1,11 +1,21 @@
 import uuid
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Float
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime, timezone
+from sqlalchemy import ARRAY, Column, Index, Integer, String, ForeignKey, DateTime, Text, Enum, Float, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
 
+def _utcnow():
+    """Client-side timestamp for bulk-inserted rows.
+
+    Rows created one at a time keep server_default=func.now(); the
+    high-volume tables set created_at in Python so bulk inserts don't
+    evaluate now() per row on the server.
+    """
+    return datetime.now(timezone.utc)
+
 # Authentication/User model
 class User(Base):
     __tablename__ = 'users'
@@ -24,6 +34,8 @@ class User(Base):
 # Project to group uploads and related data
 class Project(Base):
     __tablename__ = 'projects'
+    # Covers the (id, owner_id) ownership lookups done by every project endpoint
+    __table_args__ = (Index('ix_project_id_owner', 'id', 'owner_id'),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     owner_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(255), nullable=False)  # Will map to 'title' in API
@@ -53,6 +65,18 @@ class Video(Base):
 
     project = relationship("Project", back_populates="video")
 
+# Standalone uploads from the legacy /upload endpoint; replaces the JSON
+# sidecar metadata files that used to live in temp/
+class UploadedAsset(Base):
+    __tablename__ = 'uploaded_assets'
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    original_name = Column(String(255), nullable=True)
+    file_path = Column(String(512), nullable=False)
+    content_type = Column(String(100), nullable=True)
+    duration = Column(Float, nullable=True)
+    sample_rate = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
 # Audio file types (extracted from video, or final merged audio)
 class AudioType(enum.Enum):
     extracted = "extracted"
@@ -74,11 +98,13 @@ class AudioFile(Base):
 # Optional: Audio segments per transcription line
 class AudioSegment(Base):
     __tablename__ = 'audio_segments'
+    # Covers per-audio-file segment lookups keyed by transcription line
+    __table_args__ = (Index('ix_audio_segments_file_line', 'audio_file_id', 'transcription_line_id'),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     audio_file_id = Column(UUID(as_uuid=True), ForeignKey('audio_files.id', ondelete='CASCADE'), nullable=False)
     transcription_line_id = Column(UUID(as_uuid=True), ForeignKey('transcription_lines.id', ondelete='CASCADE'), nullable=False)
     file_path = Column(String(512), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
 
     audio_file = relationship("AudioFile", back_populates="segments")
     transcription_line = relationship("TranscriptionLine", back_populates="audio_segments")
@@ -86,14 +112,20 @@ class AudioSegment(Base):
 # Transcription line model: each line of transcript
 class TranscriptionLine(Base):
     __tablename__ = 'transcription_lines'
+    # Serves the ordered per-project transcript fetch as an index-only scan
+    __table_args__ = (Index('ix_tl_project_line', 'project_id', 'line_index'),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
     line_index = Column(Integer, nullable=False)  # order index in transcript
     text = Column(Text, nullable=False)
     start_time = Column(Float, nullable=True)  # timestamp in seconds
     end_time = Column(Float, nullable=True)
-    words = Column(JSONB, nullable=True)  # To store word-level timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Word-level timestamps stored column-oriented: three parallel arrays
+    # decode faster than JSONB objects and don't repeat key names per word
+    word_texts = Column(ARRAY(Text), nullable=True)
+    word_starts = Column(ARRAY(Float), nullable=True)
+    word_ends = Column(ARRAY(Float), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
 
     project = relationship("Project", back_populates="transcription_lines")
     audio_segments = relationship("AudioSegment", back_populates="transcription_line", cascade="all, delete-orphan")
@@ -102,6 +134,15 @@ class TranscriptionLine(Base):
 # Edit requests by user for a given transcription line
 class EditRequest(Base):
     __tablename__ = 'edit_requests'
+    # Lets "list pending edits for project" queries range-scan instead of
+    # filter, and keeps the small active subset resident via a partial index
+    __table_args__ = (
+        Index('ix_edit_requests_project_status', 'project_id', 'status'),
+        Index(
+            'ix_edit_requests_active', 'project_id', 'requested_at',
+            postgresql_where=text("status IN ('pending', 'processing')")
+        ),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
     transcription_line_id = Column(UUID(as_uuid=True), ForeignKey('transcription_lines.id', ondelete='CASCADE'), nullable=False)
@@ -1,39 +1,112 @@
 import argparse
-import os
-from moviepy.editor import VideoFileClip, AudioFileClip
+import subprocess
+
+# Preferred hardware H.264 encoders, best first; resolved lazily and cached
+_HW_ENCODER_PREFERENCE = ("h264_nvenc", "h264_qsv", "h264_videotoolbox", "h264_vaapi")
+_video_encoder = None
+
+def _pick_video_encoder():
+    """Probe ffmpeg's encoder list once and prefer a hardware H.264 encoder."""
+    global _video_encoder
+    if _video_encoder is None:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                capture_output=True, text=True, check=True
+            )
+            available = result.stdout
+        except (OSError, subprocess.CalledProcessError):
+            available = ""
+        _video_encoder = next(
+            (enc for enc in _HW_ENCODER_PREFERENCE if enc in available),
+            "libx264"
+        )
+    return _video_encoder
 
 def replace_video_audio(video_path, audio_path, output_path):
     """
     Replaces the audio of a video file with a new one.
 
+    The video stream is copied as-is (-c:v copy); only the audio is
+    re-encoded, so no H.264 decode+encode pass happens.
+
     Args:
         video_path (str): The path to the input video file.
         audio_path (str): The path to the new audio file.
         output_path (str): The path to save the output video file.
     """
-    if not os.path.exists(video_path):
-        print(f"Error: Video file not found at {video_path}")
-        return
-
-    if not os.path.exists(audio_path):
-        print(f"Error: Audio file not found at {audio_path}")
-        return
+    # No stat-before-open probes: ffmpeg reports missing inputs itself and
+    # the except below surfaces its message
 
-    try:
-        video_clip = VideoFileClip(video_path)
-        audio_clip = AudioFileClip(audio_path)
+    # Stream-copy the source audio too when it is already AAC
+    audio_codec = "copy" if _probe_audio_codec(audio_path) == "aac" else "aac"
 
-        video_with_new_audio = video_clip.set_audio(audio_clip)
-        video_with_new_audio.write_videofile(output_path, codec='libx264', audio_codec='aac')
+    command = [
+        "ffmpeg",
+        "-y",
+        "-i", video_path,
+        "-i", audio_path,
+        "-map", "0:v:0",
+        "-map", "1:a:0",
+        "-c:v", "copy",
+        "-c:a", audio_codec,
+        "-shortest",
+        output_path
+    ]
 
-        video_clip.close()
-        audio_clip.close()
-        video_with_new_audio.close()
-        
+    try:
+        try:
+            subprocess.run(command, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError:
+            # Container mismatch can make stream copy impossible; re-encode on
+            # the fastest encoder available (GPU media engine if present)
+            encoder = _pick_video_encoder()
+            if encoder == "h264_nvenc":
+                preset = ["-preset", "p1"]
+            elif encoder == "libx264":
+                preset = ["-preset", "ultrafast"]
+            else:
+                preset = []
+            fallback = [
+                "ffmpeg",
+                "-y",
+                "-i", video_path,
+                "-i", audio_path,
+                "-map", "0:v:0",
+                "-map", "1:a:0",
+                "-c:v", encoder,
+                *preset,
+                "-c:a", "aac",
+                "-shortest",
+                output_path
+            ]
+            print(f"Stream copy failed, re-encoding with {encoder}...")
+            subprocess.run(fallback, capture_output=True, text=True, check=True)
         print(f"✅ Audio replaced successfully and saved to {output_path}")
+    except FileNotFoundError:
+        print("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+    except subprocess.CalledProcessError as e:
+        print(f"An error occurred with ffmpeg: {e.stderr}")
     except Exception as e:
         print(f"An error occurred: {e}")
 
+def _probe_audio_codec(audio_path):
+    """Returns the codec name of the first audio stream, or None."""
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-select_streams", "a:0",
+                "-show_entries", "stream=codec_name",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                audio_path
+            ],
+            capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Replace the audio of a video with a new one.")
     parser.add_argument(
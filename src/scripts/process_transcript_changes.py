@@ -1,6 +1,7 @@
 import asyncio
 import os
 import re
+import tempfile
 from dotenv import load_dotenv
 import sys
 import time
@@ -12,6 +13,19 @@ from services.elevenlabs import ElevenLabsService
 from services.audio import AudioProcessor
 from core.config import config
 
+# Compiled once at import; the per-line search skips re's cache lookup
+_TS_RE = re.compile(r'\[(\d+\.\d+)s - (\d+\.\d+)s\]')
+
+# One idempotent makedirs at import instead of an exists+mkdir pair per run
+os.makedirs("temp", exist_ok=True)
+
+
+def _mkstemp_path(suffix=".mp3"):
+    """Atomically allocate a unique temp file and return its path."""
+    fd, path = tempfile.mkstemp(dir="temp", suffix=suffix)
+    os.close(fd)
+    return path
+
 
 async def process_changes(audio_path, transcript_path, changes, output_path):
     """
@@ -28,61 +42,95 @@ async def process_changes(audio_path, transcript_path, changes, output_path):
     audio_processor = AudioProcessor()
 
     with open(transcript_path, "r") as f:
-        transcript_lines = f.readlines()
-
-    original_text_to_find = list(changes.keys())[0]
-    new_text = list(changes.values())[0]
-
-    for line in transcript_lines:
-        if original_text_to_find in line:
-            match = re.search(r'\[(\d+\.\d+)s - (\d+\.\d+)s\]', line)
-            if match:
-                start_time = float(match.group(1))
-                end_time = float(match.group(2))
-                print(f"Found segment to replace from {start_time}s to {end_time}s.")
-                print(f"Original text: {original_text_to_find}")
-                print(f"New text: {new_text}")
-
-                # 1. Generate new audio from text
-                print("Generating new audio using ElevenLabs...")
-                voice_id = config.VOICE_ID
-                try:
-                    new_audio_data = await elevenlabs_service.generate_speech(
-                        text=new_text,
-                        voice_id=voice_id
-                    )
-                except Exception as e:
-                    print(f"Error calling ElevenLabs API: {e}")
-                    # Check for missing API key
-                    if "ELEVENLABS_API_KEY" in str(e):
-                        print("Please make sure your ELEVENLABS_API_KEY is set in a .env file.")
-                    return
-
-                temp_audio_path = "temp/temp_new_audio.mp3"
-                with open(temp_audio_path, "wb") as f:
-                    f.write(new_audio_data)
-                print(f"New audio saved to {temp_audio_path}")
-
-                # 2. Replace audio segment
-                print("Replacing audio segment...")
-                try:
-                    audio_processor.replace_segment(
-                        original_path=audio_path,
-                        replacement_path=temp_audio_path,
-                        start_time=start_time,
-                        end_time=end_time,
-                        output_path=output_path,
-                    )
-                    print(f"✅ Audio processing complete. Output saved to {output_path}")
-                except Exception as e:
-                    print(f"Error during audio replacement: {e}")
-                finally:
-                    # Clean up temporary file
-                    if os.path.exists(temp_audio_path):
-                        os.remove(temp_audio_path)
-                return
-
-    print(f"Could not find the text '{original_text_to_find}' in the transcript.")
+        transcript_text = f.read()
+
+    # One multi-pattern pass over the whole transcript: an alternation of
+    # escaped literals finds every requested change at once, and the
+    # timestamp regex only runs on the line slices that matched
+    finder = re.compile("|".join(re.escape(k) for k in changes))
+    segments = []
+    for m in finder.finditer(transcript_text):
+        line_start = transcript_text.rfind('\n', 0, m.start()) + 1
+        line_end = transcript_text.find('\n', m.start())
+        if line_end < 0:
+            line_end = len(transcript_text)
+        ts = _TS_RE.search(transcript_text, line_start, line_end)
+        if ts:
+            segments.append((float(ts.group(1)), float(ts.group(2)), m.group(0)))
+
+    if not segments:
+        print("Could not find any of the requested texts in the transcript.")
+        return
+
+    for start_time, end_time, original_text in segments:
+        print(f"Found segment to replace from {start_time}s to {end_time}s.")
+        print(f"Original text: {original_text}")
+        print(f"New text: {changes[original_text]}")
+
+    # 1. Stream all replacement clips straight to disk concurrently; the
+    # response bodies are never buffered wholesale in memory
+    print("Generating new audio using ElevenLabs...")
+    voice_id = config.VOICE_ID
+    # mkstemp gives each invocation its own files, so concurrent runs can't
+    # clobber one another's clips
+    clip_paths = [_mkstemp_path() for _ in segments]
+    temp_paths = list(clip_paths)
+
+    async def _stream_clip(text, path):
+        with open(path, "wb") as f:
+            await elevenlabs_service.generate_speech_stream(
+                text=text,
+                voice_id=voice_id,
+                out_fp=f
+            )
+
+    try:
+        try:
+            await asyncio.gather(*[
+                _stream_clip(changes[original_text], path)
+                for (_, _, original_text), path in zip(segments, clip_paths)
+            ])
+        except Exception as e:
+            print(f"Error calling ElevenLabs API: {e}")
+            # Check for missing API key
+            if "ELEVENLABS_API_KEY" in str(e):
+                print("Please make sure your ELEVENLABS_API_KEY is set in a .env file.")
+            return
+
+        # 2. Replace audio segments from the end of the file backwards so
+        # earlier timestamps stay valid as segment durations change
+        print("Replacing audio segments...")
+        ordered = sorted(zip(segments, clip_paths), key=lambda item: item[0][0], reverse=True)
+        current_input = audio_path
+        try:
+            for i, ((start_time, end_time, _), temp_audio_path) in enumerate(ordered):
+                if i == len(ordered) - 1:
+                    step_output = output_path
+                else:
+                    step_output = _mkstemp_path()
+                    temp_paths.append(step_output)
+
+                # ffmpeg/moviepy work is blocking; run it in a worker thread
+                # so the event loop stays free for the other coroutines
+                await asyncio.to_thread(
+                    audio_processor.replace_segment,
+                    original_path=current_input,
+                    replacement_path=temp_audio_path,
+                    start_time=start_time,
+                    end_time=end_time,
+                    output_path=step_output,
+                )
+                current_input = step_output
+            print(f"✅ Audio processing complete. Output saved to {output_path}")
+        except Exception as e:
+            print(f"Error during audio replacement: {e}")
+    finally:
+        # Clean up temporary files; EAFP saves the stat-before-unlink
+        for temp_path in temp_paths:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
 
 
 if __name__ == "__main__":
@@ -96,8 +144,4 @@ if __name__ == "__main__":
         "Because that's this guy's sub, I should order one.": "because thats this subway sub, I should not order one"
     }
 
-    # Ensure temp directory exists
-    if not os.path.exists("temp"):
-        os.makedirs("temp")
-
-    asyncio.run(process_changes(AUDIO_FILE, TRANSCRIPT_FILE, CHANGES_TO_APPLY, OUTPUT_FILE)) 
\ No newline at end of file
+    asyncio.run(process_changes(AUDIO_FILE, TRANSCRIPT_FILE, CHANGES_TO_APPLY, OUTPUT_FILE))
\ No newline at end of file
@@ -4,6 +4,10 @@ import asyncio
 
 BASE_URL = "http://localhost:8000"
 
+# Shared client: repeated seed calls reuse one TCP connection instead of
+# handshaking per request
+_client = httpx.AsyncClient(timeout=30.0)
+
 async def seed_user():
     url = f"{BASE_URL}/auth/register"
     user_data = {
@@ -14,22 +18,27 @@ async def seed_user():
         "last_name": "AI"
     }
     headers = {"Content-Type": "application/json"}
-    
+
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            print(f"Attempting to connect to {url}...")
-            response = await client.post(url, json=user_data, headers=headers)
-            print(f"Received response with status code: {response.status_code}")
-            response.raise_for_status()
-            
-            print("User seeded successfully!")
-            print("Response:", response.json())
-            
+        print(f"Attempting to connect to {url}...")
+        response = await _client.post(url, json=user_data, headers=headers)
+        print(f"Received response with status code: {response.status_code}")
+        response.raise_for_status()
+
+        print("User seeded successfully!")
+        print("Response:", response.json())
+
     except httpx.HTTPStatusError as e:
         print(f"HTTP Error: {e.response.status_code} - {e.response.text}")
     except httpx.RequestError as e:
         print(f"An error occurred while requesting {e.request.url!r}.")
         print(f"Error details: {e}")
 
+async def _main():
+    try:
+        await seed_user()
+    finally:
+        await _client.aclose()
+
 if __name__ == "__main__":
-    asyncio.run(seed_user()) 
\ No newline at end of file
+    asyncio.run(_main())
\ No newline at end of file
@@ -15,16 +15,22 @@ def trim_audio(input_file: str, output_file: str, start_time: str, end_time: str
         start_time (str): The start time for the trim (format: HH:MM:SS).
         end_time (str): The end time for the trim (format: HH:MM:SS).
     """
+    # -ss/-to before -i trigger a container-level fast seek instead of
+    # decoding (and discarding) everything up to the cut point. With -c copy
+    # the cut lands on the nearest packet/keyframe boundary, which is the
+    # accepted tradeoff for a lossless trim.
     command = [
         "ffmpeg",
-        "-i",
-        input_file,
         "-ss",
         start_time,
         "-to",
         end_time,
+        "-i",
+        input_file,
         "-c",
         "copy",
+        "-avoid_negative_ts",
+        "make_zero",
         output_file,
     ]
 
@@ -1,6 +1,32 @@
-# Business logic services package 
+# Business logic services package
 
-from .audio import AudioProcessor
-from .elevenlabs import ElevenLabsService
-from .transcript import TranscriptGenerator
-from .video import VideoAudioReplacer 
\ No newline at end of file
+# The service modules are heavy to import (moviepy alone pulls in numpy,
+# imageio and friends), so exports resolve lazily via PEP 562: each module
+# loads on first attribute access instead of at package import.
+
+import importlib
+
+_lazy_imports = {
+    "AudioProcessor": "services.audio",
+    "ElevenLabsService": "services.elevenlabs",
+    "get_elevenlabs_service": "services.elevenlabs",
+    "TranscriptGenerator": "services.transcript",
+    "get_transcript_generator": "services.transcript",
+    "VideoAudioReplacer": "services.video",
+    "replace_video_audio_from_bytes": "services.video",
+    "replace_video_audio_from_bytes_async": "services.video",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _lazy_imports[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
@@ -1,23 +1,173 @@
+import base64
+import hashlib
+import json
+import math
 import os
 import numpy as np
 import wave
 import struct
-from moviepy.editor import VideoFileClip, AudioFileClip, CompositeAudioClip, concatenate_audioclips
-from moviepy.video.fx.speedx import speedx
 from typing import List, Dict, Any, Optional
 import logging
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 class AudioProcessor:
     def __init__(self):
         self.temp_dir = tempfile.gettempdir()
+        # In-process memo of computed waveforms; backed by .npy files on disk
+        self._waveform_cache = {}
+
+    def _waveform_cache_key(self, file_path: str, resolution: int) -> str:
+        """Cache key from a 1MiB content sample, the file size, and resolution"""
+        file_size = os.path.getsize(file_path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as f:
+            digest.update(f.read(1 << 20))
+        digest.update(str(file_size).encode())
+        return f"{digest.hexdigest()}_{resolution}"
     
+    def _decode_pcm(self, file_path: str, target_sr: Optional[int] = None, mono: bool = True) -> np.ndarray:
+        """
+        Decode audio to float32 samples in [-1, 1] through a direct ffmpeg
+        s16le pipe — no float64 intermediate and no per-frame moviepy
+        wrapping. Falls back to moviepy if the ffmpeg binary is missing.
+        """
+        command = ['ffmpeg', '-v', 'error', '-i', file_path, '-f', 's16le', '-acodec', 'pcm_s16le']
+        if mono:
+            command += ['-ac', '1']
+        if target_sr:
+            command += ['-ar', str(target_sr)]
+        command.append('-')
+
+        try:
+            result = subprocess.run(command, capture_output=True, check=True)
+            samples = np.frombuffer(result.stdout, dtype=np.int16)
+            # Cast then multiply by the precomputed reciprocal
+            return samples.astype(np.float32) * (1.0 / 32768.0)
+        except FileNotFoundError:
+            from moviepy.editor import AudioFileClip
+
+            audio_clip = AudioFileClip(file_path)
+            audio_data = audio_clip.to_soundarray()
+            audio_clip.close()
+            if mono and audio_data.ndim > 1:
+                if audio_data.shape[1] == 2:
+                    # float32 accumulator: half the memory bandwidth of a
+                    # float64 mean over moviepy's float64 frames
+                    audio_data = (
+                        audio_data[:, 0].astype(np.float32, copy=False)
+                        + audio_data[:, 1].astype(np.float32, copy=False)
+                    ) * np.float32(0.5)
+                else:
+                    audio_data = np.mean(audio_data, axis=1, dtype=np.float32)
+            return audio_data.astype(np.float32, copy=False)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"PCM decode failed: {e.stderr.decode(errors='replace')}")
+
+    # Ceiling on the waveform analysis decode rate; the actual rate is
+    # derived from the requested resolution in _stream_waveform_rms
+    _WAVEFORM_SR = 8000
+
+    def _stream_waveform_rms(self, file_path: str, resolution: int) -> Optional[np.ndarray]:
+        """
+        Stream per-point RMS values straight off an ffmpeg s16le pipe.
+
+        ffmpeg resamples to low-rate mono and the pipe is consumed one
+        fixed-size block per waveform point, so peak memory is a single
+        block rather than the decoded track. Returns None when ffmpeg or
+        the duration probe is unavailable so the caller can fall back to
+        the in-memory decode.
+        """
+        duration = self._probe_duration(file_path)
+        if not duration:
+            return None
+
+        # Resample so roughly four samples land in each visualization bin
+        # (floored at 100 Hz, capped at the analysis ceiling); swresample
+        # decimates in C, so the pipe carries ~4*resolution samples no
+        # matter the source rate or duration
+        target_sr = max(100, min(self._WAVEFORM_SR, int(resolution * 4 / duration)))
+
+        total_samples = int(duration * target_sr)
+        samples_per_point = max(1, total_samples // resolution)
+        chunk_bytes = samples_per_point * 2
+
+        command = [
+            'ffmpeg', '-v', 'error', '-i', file_path,
+            '-f', 's16le', '-acodec', 'pcm_s16le',
+            '-ac', '1', '-ar', str(target_sr), '-'
+        ]
+        try:
+            proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            return None
+
+        points = []
+        try:
+            read = proc.stdout.read
+            while True:
+                chunk = read(chunk_bytes)
+                if len(chunk) < chunk_bytes:
+                    break  # ragged tail dropped, same as the block reshape
+                # Multiply-accumulate directly on the int16 view with an
+                # int64 accumulator; the block is never converted to float
+                block = np.frombuffer(chunk, dtype=np.int16)
+                acc = np.einsum('i,i->', block, block, dtype=np.int64)
+                points.append(math.sqrt(acc / samples_per_point))
+        finally:
+            proc.stdout.close()
+            proc.wait()
+
+        if proc.returncode != 0 or not points:
+            return None
+        # int16-scale RMS; the caller's max-normalization makes scale moot
+        return np.asarray(points, dtype=np.float32)
+
+    def _ffprobe(self, file_path: str) -> Dict[str, Any]:
+        """Header-only probe: format + streams as JSON, no decoder init"""
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_streams', '-show_format', '-of', 'json', file_path],
+            capture_output=True, check=True
+        )
+        return json.loads(result.stdout)
+
     def get_file_metadata(self, file_path: str) -> Dict[str, Any]:
         """Extract metadata from audio/video file"""
         try:
+            probe = self._ffprobe(file_path)
+            streams = probe.get("streams", [])
+            duration = float(probe.get("format", {}).get("duration", 0) or 0)
+            video = next((s for s in streams if s.get("codec_type") == "video"), None)
+            audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+            if video:
+                num, _, den = (video.get("avg_frame_rate") or "0/1").partition("/")
+                fps = float(num) / float(den) if den and float(den) else 0.0
+                return {
+                    "duration": duration,
+                    "fps": fps,
+                    "has_audio": audio is not None,
+                    "file_type": "video",
+                    "sample_rate": int(audio["sample_rate"]) if audio and audio.get("sample_rate") else 44100,
+                    "channels": int(audio.get("channels", 2)) if audio else 2
+                }
+            if audio:
+                return {
+                    "duration": duration,
+                    "sample_rate": int(audio.get("sample_rate", 44100) or 44100),
+                    "channels": int(audio.get("channels", 2) or 2),
+                    "file_type": "audio"
+                }
+        except Exception as e:
+            logger.warning(f"ffprobe failed for {file_path}, falling back to moviepy: {e}")
+
+        # moviepy fallback: only reached when ffprobe can't read the file
+        try:
+            from moviepy.editor import AudioFileClip, VideoFileClip
+
             # Try to process as video first
             try:
                 clip = VideoFileClip(file_path)
@@ -27,17 +177,17 @@ class AudioProcessor:
                     "has_audio": clip.audio is not None,
                     "file_type": "video"
                 }
-                
+
                 if clip.audio:
                     metadata["sample_rate"] = clip.audio.fps
                     metadata["channels"] = clip.audio.nchannels
                 else:
                     metadata["sample_rate"] = 44100
                     metadata["channels"] = 2
-                
+
                 clip.close()
                 return metadata
-                
+
             except Exception:
                 # Try as audio file
                 audio_clip = AudioFileClip(file_path)
@@ -49,7 +199,7 @@ class AudioProcessor:
                 }
                 audio_clip.close()
                 return metadata
-                
+
         except Exception as e:
             logger.error(f"Error extracting metadata from {file_path}: {e}")
             return {
@@ -59,44 +209,65 @@ class AudioProcessor:
                 "file_type": "unknown"
             }
     
-    def generate_waveform(self, file_path: str, resolution: int = 1000) -> List[float]:
-        """Generate waveform data for visualization"""
+    def generate_waveform(self, file_path: str, resolution: int = 1000) -> str:
+        """
+        Generate waveform data for visualization.
+
+        Returns base64-encoded int16 samples (clients rescale by /32767);
+        visual fidelity doesn't need float precision and int16 halves both
+        the payload and the cache entries.
+        """
         try:
-            # Load audio
-            audio_clip = AudioFileClip(file_path)
-            
-            # Get audio data
-            audio_data = audio_clip.to_soundarray()
-            audio_clip.close()
-            
-            if len(audio_data.shape) > 1:
-                # Convert to mono by averaging channels
-                audio_data = np.mean(audio_data, axis=1)
-            
-            # Downsample for waveform visualization
-            total_samples = len(audio_data)
-            samples_per_point = max(1, total_samples // resolution)
-            
-            waveform = []
-            for i in range(0, total_samples, samples_per_point):
-                chunk = audio_data[i:i + samples_per_point]
-                if len(chunk) > 0:
-                    # Calculate RMS (root mean square) for this chunk
-                    rms = np.sqrt(np.mean(chunk ** 2))
-                    waveform.append(float(rms))
-            
+            # Reuse a previous computation for identical content + resolution
+            try:
+                cache_key = self._waveform_cache_key(file_path, resolution)
+            except OSError:
+                cache_key = None
+
+            if cache_key:
+                cached = self._waveform_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+                cache_file = os.path.join(self.temp_dir, f"waveform_{cache_key}.npy")
+                if os.path.exists(cache_file):
+                    encoded = base64.b64encode(np.load(cache_file).tobytes()).decode("ascii")
+                    self._waveform_cache[cache_key] = encoded
+                    return encoded
+
+            # Stream low-rate PCM off the ffmpeg pipe, one RMS per block;
+            # the decoded track never materializes in Python all at once
+            waveform = self._stream_waveform_rms(file_path, resolution)
+            if waveform is None:
+                # Fallback: full in-memory decode + vectorized block RMS;
+                # einsum fuses square+sum without a squared temporary
+                audio_data = self._decode_pcm(file_path)
+                total_samples = len(audio_data)
+                samples_per_point = max(1, total_samples // resolution)
+                n = total_samples // samples_per_point
+
+                blocks = audio_data[:n * samples_per_point].reshape(n, samples_per_point)
+                waveform = np.sqrt(np.einsum('ij,ij->i', blocks, blocks) / samples_per_point)
+
             # Normalize waveform
-            if waveform:
-                max_val = max(waveform)
-                if max_val > 0:
-                    waveform = [val / max_val for val in waveform]
-            
+            max_val = waveform.max() if waveform.size else 0.0
+            if max_val > 0:
+                waveform /= max_val
+
+            # Quantize to int16 for the wire format and the cache
+            quantized = np.round(waveform * 32767).astype(np.int16)
+            encoded = base64.b64encode(quantized.tobytes()).decode("ascii")
+
+            if cache_key:
+                np.save(cache_file, quantized)
+                self._waveform_cache[cache_key] = encoded
+
             logger.info(f"Generated waveform with {len(waveform)} points")
-            return waveform
-            
+            return encoded
+
         except Exception as e:
             logger.error(f"Error generating waveform for {file_path}: {e}")
-            return [0.0] * resolution
+            return base64.b64encode(np.zeros(resolution, dtype=np.int16).tobytes()).decode("ascii")
     
     def replace_segment(
         self,
@@ -108,6 +279,8 @@ class AudioProcessor:
     ):
         """Replace audio segment with new audio"""
         try:
+            from moviepy.editor import AudioFileClip, concatenate_audioclips
+
             # Load original audio
             original_audio = AudioFileClip(original_path)
             replacement_audio = AudioFileClip(replacement_path)
@@ -155,8 +328,32 @@ class AudioProcessor:
             
         except Exception as e:
             logger.error(f"Error replacing video audio: {e}")
-            # Fallback to moviepy method
+            # First fallback: direct ffmpeg mux with the H.264 stream copied;
+            # only the audio is encoded, no video decode+encode pass
             try:
+                subprocess.run(
+                    [
+                        'ffmpeg', '-y',
+                        '-i', video_path,
+                        '-i', audio_path,
+                        '-map', '0:v:0',
+                        '-map', '1:a:0',
+                        '-c:v', 'copy',
+                        '-c:a', 'aac',
+                        '-shortest',
+                        output_path
+                    ],
+                    capture_output=True, check=True
+                )
+                logger.info(f"Video audio replaced successfully (stream copy): {output_path}")
+                return
+            except Exception as copy_error:
+                logger.error(f"Stream-copy mux failed: {copy_error}")
+
+            # Last resort: moviepy full re-encode
+            try:
+                from moviepy.editor import AudioFileClip, VideoFileClip
+
                 video_clip = VideoFileClip(video_path)
                 audio_clip = AudioFileClip(audio_path)
                 
@@ -177,29 +374,116 @@ class AudioProcessor:
                 logger.error(f"Fallback method also failed: {fallback_error}")
                 raise Exception(f"Video audio replacement failed: {str(e)}")
     
-    def extract_audio_from_video(self, video_path: str, output_path: str):
-        """Extract audio track from video file"""
+    def extract_audio_from_video(self, video_path: str, output_path: str, num_threads: Optional[int] = None):
+        """Extract audio track from video file using ffmpeg with multi-threaded decoding"""
         try:
-            video_clip = VideoFileClip(video_path)
-            
-            if video_clip.audio is None:
-                raise Exception("Video file has no audio track")
-            
-            audio_clip = video_clip.audio
-            audio_clip.write_audiofile(output_path, codec='mp3')
-            
-            video_clip.close()
-            audio_clip.close()
-            
+            if num_threads is None:
+                num_threads = os.cpu_count() or 1
+
+            command = [
+                'ffmpeg',
+                '-y',  # Overwrite output file if it exists
+                '-threads', str(num_threads),
+                '-i', video_path,
+                '-vn',  # Drop the video stream
+                '-acodec', 'libmp3lame',
+                output_path
+            ]
+
+            subprocess.run(command, capture_output=True, text=True, check=True)
             logger.info(f"Audio extracted from video: {output_path}")
-            
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error extracting audio from video: {e.stderr}")
+            raise Exception(f"Audio extraction failed: {e.stderr}")
         except Exception as e:
             logger.error(f"Error extracting audio from video: {e}")
             raise Exception(f"Audio extraction failed: {str(e)}")
     
+    def _probe_duration(self, file_path: str) -> float:
+        """Read media duration via ffprobe without decoding"""
+        try:
+            result = subprocess.run(
+                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                 '-of', 'default=noprint_wrappers=1:nokey=1', file_path],
+                capture_output=True, text=True, check=True
+            )
+            return float(result.stdout.strip())
+        except Exception:
+            return 0.0
+
+    def extract_audio_parallel(self, video_path: str, output_path: str, c: Optional[int] = None):
+        """
+        Extract audio from a long video by decoding time intervals in parallel
+        ffmpeg workers (seeks land on the nearest prior keyframe) and
+        concatenating the per-interval WAVs into the final MP3.
+        """
+        if c is None:
+            c = os.cpu_count() or 1
+
+        duration = self._probe_duration(video_path)
+        # Short videos aren't worth the split + concat overhead
+        if c <= 1 or duration < 60:
+            self.extract_audio_from_video(video_path, output_path)
+            return
+
+        interval = duration / c
+
+        try:
+            with tempfile.TemporaryDirectory(dir=self.temp_dir) as workdir:
+                def extract_chunk(index: int) -> str:
+                    start = index * interval
+                    chunk_duration = interval if index < c - 1 else duration - start
+                    chunk_path = os.path.join(workdir, f"chunk_{index:04d}.wav")
+                    command = [
+                        'ffmpeg', '-y',
+                        '-ss', f"{start:.3f}",
+                        '-i', video_path,
+                        '-t', f"{chunk_duration:.3f}",
+                        '-vn',
+                        '-acodec', 'pcm_s16le',
+                        chunk_path
+                    ]
+                    subprocess.run(command, capture_output=True, text=True, check=True)
+                    return chunk_path
+
+                # ffmpeg subprocesses run outside the GIL, so threads suffice
+                with ThreadPoolExecutor(max_workers=c) as pool:
+                    chunk_paths = list(pool.map(extract_chunk, range(c)))
+
+                # Stitch the chunks and encode the final MP3 in one pass
+                concat_list = os.path.join(workdir, "chunks.txt")
+                with open(concat_list, "w") as f:
+                    for path in chunk_paths:
+                        f.write(f"file '{path}'\n")
+
+                command = [
+                    'ffmpeg', '-y',
+                    '-f', 'concat', '-safe', '0',
+                    '-i', concat_list,
+                    '-acodec', 'libmp3lame',
+                    output_path
+                ]
+                subprocess.run(command, capture_output=True, text=True, check=True)
+
+            logger.info(f"Audio extracted in {c} parallel chunks: {output_path}")
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error extracting audio in parallel: {e.stderr}")
+            raise Exception(f"Audio extraction failed: {e.stderr}")
+        except Exception as e:
+            logger.error(f"Error extracting audio in parallel: {e}")
+            raise Exception(f"Audio extraction failed: {str(e)}")
+
     def get_audio_duration(self, file_path: str) -> float:
         """Get duration of audio file"""
+        duration = self._probe_duration(file_path)
+        if duration:
+            return duration
+        # moviepy fallback: only reached when ffprobe can't read the file
         try:
+            from moviepy.editor import AudioFileClip
+
             audio_clip = AudioFileClip(file_path)
             duration = audio_clip.duration
             audio_clip.close()
@@ -211,44 +495,55 @@ class AudioProcessor:
     def normalize_audio_levels(self, audio_paths: List[str], output_path: str):
         """Normalize audio levels across multiple files"""
         try:
-            audio_clips = [AudioFileClip(path) for path in audio_paths]
-            
-            # Find the maximum RMS level
-            max_rms = 0
-            for clip in audio_clips:
-                audio_data = clip.to_soundarray()
-                if len(audio_data.shape) > 1:
-                    audio_data = np.mean(audio_data, axis=1)
-                rms = np.sqrt(np.mean(audio_data ** 2))
+            sample_rate = 44100
+
+            # Decode every file in parallel — each worker just blocks on its
+            # own ffmpeg subprocess, so N clips cost about the slowest decode
+            with ThreadPoolExecutor(max_workers=min(8, max(1, len(audio_paths)))) as executor:
+                arrays = list(executor.map(
+                    lambda path: self._decode_pcm(path, target_sr=sample_rate),
+                    audio_paths
+                ))
+
+            # Single decode per file; keep each float32 array with its RMS
+            decoded = []
+            max_rms = 0.0
+            for audio_data in arrays:
+                # einsum fuses square+sum in one pass, no squared temporary
+                if audio_data.size:
+                    rms = float(np.sqrt(np.einsum('i,i->', audio_data, audio_data) / audio_data.size))
+                else:
+                    rms = 0.0
+                decoded.append((audio_data, rms))
                 max_rms = max(max_rms, rms)
-            
-            # Normalize all clips to the same RMS level
-            normalized_clips = []
-            for clip in audio_clips:
-                audio_data = clip.to_soundarray()
-                if len(audio_data.shape) > 1:
-                    audio_data = np.mean(audio_data, axis=1)
-                rms = np.sqrt(np.mean(audio_data ** 2))
-                
+
+            # Apply the gain in memory and composite (sum) the tracks, the
+            # same mix CompositeAudioClip produced
+            total_len = max((len(d) for d, _ in decoded), default=0)
+            mixed = np.zeros(total_len, dtype=np.float32)
+            for audio_data, rms in decoded:
                 if rms > 0:
-                    gain = max_rms / rms
-                    normalized_clip = clip.fx.volumex(gain)
-                else:
-                    normalized_clip = clip
-                
-                normalized_clips.append(normalized_clip)
-            
-            # Combine normalized clips
-            final_audio = CompositeAudioClip(normalized_clips)
-            final_audio.write_audiofile(output_path, codec='mp3')
-            
-            # Clean up
-            for clip in audio_clips + normalized_clips:
-                clip.close()
-            final_audio.close()
-            
+                    audio_data = audio_data * np.float32(max_rms / rms)
+                mixed[:len(audio_data)] += audio_data
+
+            np.clip(mixed, -1.0, 1.0, out=mixed)
+
+            # Encode once through an ffmpeg stdin pipe; no moviepy frame
+            # iteration and no second decode of any input
+            pcm = (mixed * 32767.0).astype(np.int16).tobytes()
+            subprocess.run(
+                [
+                    'ffmpeg', '-y',
+                    '-f', 's16le', '-ar', str(sample_rate), '-ac', '1',
+                    '-i', 'pipe:0',
+                    '-c:a', 'libmp3lame',
+                    output_path
+                ],
+                input=pcm, capture_output=True, check=True
+            )
+
             logger.info(f"Audio levels normalized: {output_path}")
-            
+
         except Exception as e:
             logger.error(f"Error normalizing audio levels: {e}")
             raise Exception(f"Audio normalization failed: {str(e)}")
@@ -256,6 +551,16 @@ class AudioProcessor:
     def validate_audio_file(self, file_path: str) -> bool:
         """Validate if file is a valid audio file"""
         try:
+            probe = self._ffprobe(file_path)
+            if any(s.get("codec_type") == "audio" for s in probe.get("streams", [])):
+                return float(probe.get("format", {}).get("duration", 0) or 0) > 0
+            return False
+        except Exception:
+            pass
+        # moviepy fallback: only reached when ffprobe can't read the file
+        try:
+            from moviepy.editor import AudioFileClip
+
             audio_clip = AudioFileClip(file_path)
             duration = audio_clip.duration
             audio_clip.close()
@@ -266,18 +571,37 @@ class AudioProcessor:
     def get_audio_info(self, file_path: str) -> Dict[str, Any]:
         """Get detailed audio information"""
         try:
+            probe = self._ffprobe(file_path)
+            audio = next(
+                (s for s in probe.get("streams", []) if s.get("codec_type") == "audio"),
+                None
+            )
+            if audio:
+                return {
+                    "duration": float(probe.get("format", {}).get("duration", 0) or 0),
+                    "sample_rate": int(audio.get("sample_rate", 0) or 0),
+                    "channels": int(audio.get("channels", 0) or 0),
+                    "format": os.path.splitext(file_path)[1][1:].lower()
+                }
+        except Exception as e:
+            logger.warning(f"ffprobe failed for {file_path}, falling back to moviepy: {e}")
+
+        # moviepy fallback: only reached when ffprobe can't read the file
+        try:
+            from moviepy.editor import AudioFileClip
+
             audio_clip = AudioFileClip(file_path)
-            
+
             info = {
                 "duration": audio_clip.duration,
                 "sample_rate": audio_clip.fps,
                 "channels": audio_clip.nchannels,
                 "format": os.path.splitext(file_path)[1][1:].lower()
             }
-            
+
             audio_clip.close()
             return info
-            
+
         except Exception as e:
             logger.error(f"Error getting audio info: {e}")
             return {} 
\ No newline at end of file
@@ -1,32 +1,40 @@
+import asyncio
 import os
+import re
 import uuid
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from moviepy.editor import AudioFileClip, VideoFileClip, CompositeAudioClip, concatenate_audioclips
 from models.database import Project, TranscriptionLine, AudioFile, AudioType, Video
 from models.api import TranscriptChange
 from typing import List
-from services.elevenlabs import ElevenLabsService
+from services.elevenlabs import get_elevenlabs_service
 from services.audio import AudioProcessor
-from services.transcript import TranscriptGenerator
+from services.transcript import get_transcript_generator
+from services.video import multi_output
 from core.config import config
 
+# Cap on in-flight ElevenLabs requests when regenerating multiple lines
+_TTS_CONCURRENCY = 8
+
 async def apply_transcript_changes(db: Session, project_id: str, changes: List[TranscriptChange]):
     """
     Applies transcript changes to a project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.get(Project, project_id)
     if not project:
         raise Exception("Project not found")
 
-    original_audio_file = db.query(AudioFile).filter(
-        AudioFile.project_id == project_id,
-        AudioFile.type == AudioType.extracted
-    ).first()
+    original_audio_file = db.execute(
+        select(AudioFile).where(
+            AudioFile.project_id == project_id,
+            AudioFile.type == AudioType.extracted
+        )
+    ).scalars().first()
     if not original_audio_file:
         raise Exception("Original audio file not found for the project")
 
     print("Re-transcribing audio to get word-level timestamps...")
-    transcript_generator = TranscriptGenerator()
+    transcript_generator = get_transcript_generator()
     full_transcript = transcript_generator.generate_transcript(
         original_audio_file.file_path, 
         get_word_timestamps=True
@@ -49,11 +57,15 @@ async def apply_transcript_changes(db: Session, project_id: str, changes: List[T
 
     print(f"Processing {len(changes)} changes across {len(changes_by_line)} transcript lines")
 
-    elevenlabs_service = ElevenLabsService()
+    # Shared instance: its persistent HTTP/2 client is reused across
+    # apply-changes requests and closed once at app shutdown
+    elevenlabs_service = get_elevenlabs_service()
     new_audio_segments = []
     temp_files = []
 
-    # Process each line only once, applying all changes to that line
+    # First pass: apply each line's text edits once and collect the lines
+    # that need fresh audio
+    tts_jobs = []
     for line_id, line_changes in changes_by_line.items():
         line = lines_map.get(line_id)
         if not line:
@@ -68,105 +80,173 @@ async def apply_transcript_changes(db: Session, project_id: str, changes: List[T
             print(f"Warning: Could not determine timestamp for line {line_id}")
             continue
 
-        # Apply all changes to this line at once
-        new_line_text = line.text
+        # Apply all changes to this line in one pass: an alternation of
+        # escaped literals scans the text once, and longest-first ordering
+        # keeps one replacement from rewriting inside another
+        mapping = {change.old_text: change.new_text for change in line_changes}
         for change in line_changes:
             print(f"Applying change {change.id}: '{change.old_text}' -> '{change.new_text}'")
-            new_line_text = new_line_text.replace(change.old_text, change.new_text)
+        pattern = re.compile("|".join(
+            re.escape(old) for old in sorted(mapping, key=len, reverse=True)
+        ))
+        new_line_text = pattern.sub(lambda m: mapping[m.group(0)], line.text)
 
         # Update the transcript line in the database
         line.text = new_line_text
         print(f"Updated transcript line {line_id} with {len(line_changes)} changes: '{new_line_text}'")
 
-        # Generate audio only once for this line with all changes applied
-        print(f"Generating audio for line {line_id}: '{new_line_text}'")
-        try:
-            audio_bytes = await elevenlabs_service.generate_speech(
-                text=new_line_text,
-                voice_id=config.VOICE_ID
-            )
-            
-            temp_dir = "temp"
-            if not os.path.exists(temp_dir):
-                os.makedirs(temp_dir)
-
-            new_audio_path = os.path.join(temp_dir, f"{uuid.uuid4()}.mp3")
-            with open(new_audio_path, "wb") as f:
-                f.write(audio_bytes)
-            temp_files.append(new_audio_path)
+        tts_jobs.append({
+            "line_id": line_id,
+            "text": new_line_text,
+            "start_time": start_time,
+            "end_time": end_time,
+        })
+
+    # Capture everything the later stages need from the ORM, then flush the
+    # text edits on a worker thread while the TTS calls run. The session is
+    # not touched again until the commit is awaited, so no transaction is
+    # held open across the network and ffmpeg work below.
+    audio_processor = AudioProcessor()
+    original_audio_path = original_audio_file.file_path
+    original_video_path = project.video.file_path
+    project_pk = project.id
+    # Edited lines changed the transcript content: touch the project so
+    # ETags derived from its updated_at invalidate with this commit
+    if tts_jobs:
+        project.updated_at = func.now()
+    commit_task = asyncio.create_task(asyncio.to_thread(db.commit))
+
+    try:
+        if tts_jobs:
+            os.makedirs("temp", exist_ok=True)
+
+        # Generate all replacement clips concurrently; the semaphore caps
+        # in-flight API calls and gather preserves job order in the results.
+        # Each response streams straight into its temp file, so the mp3 never
+        # sits in memory as a whole-bytes intermediate.
+        semaphore = asyncio.Semaphore(_TTS_CONCURRENCY)
+
+        async def _generate_line_audio(job):
+            async with semaphore:
+                print(f"Generating audio for line {job['line_id']}: '{job['text']}'")
+                path = os.path.join("temp", f"{uuid.uuid4()}.mp3")
+                with open(path, "wb") as f:
+                    await elevenlabs_service.generate_speech_stream(
+                        text=job["text"],
+                        voice_id=config.VOICE_ID,
+                        out_fp=f
+                    )
+                return path
+
+        results = await asyncio.gather(
+            *(_generate_line_audio(job) for job in tts_jobs),
+            return_exceptions=True
+        )
+
+        for job, clip_path in zip(tts_jobs, results):
+            if isinstance(clip_path, BaseException):
+                print(f"Warning: Could not generate audio for line {job['line_id']} '{job['text']}': {clip_path}")
+                continue
+
+            temp_files.append(clip_path)
 
             # Create single audio segment for this line
             new_audio_segments.append({
-                "path": new_audio_path,
-                "start_time": start_time,
-                "end_time": end_time,
+                "path": clip_path,
+                "start_time": job["start_time"],
+                "end_time": job["end_time"],
             })
 
-        except Exception as e:
-            print(f"Warning: Could not generate audio for line {line_id} '{new_line_text}': {e}")
-            continue
-
-    print(f"Generated {len(new_audio_segments)} new audio clips for {len(changes_by_line)} modified lines.")
-
-    # Commit transcript text changes to database even if no audio was generated
-    db.commit()
-    print("Transcript changes saved to database.")
-
-    if not new_audio_segments:
-        print("No audio changes to apply.")
-        return {"message": "Transcript changes applied successfully (no audio generation needed)."}
-
-    # Sort segments by start time to process them in order
-    new_audio_segments.sort(key=lambda x: x['start_time'])
-    
-    original_clip = AudioFileClip(original_audio_file.file_path)
-    final_clips = []
-    last_end_time = 0
-
-    for segment in new_audio_segments:
-        # Add the portion of original audio before the current change
-        if segment['start_time'] > last_end_time:
-            final_clips.append(original_clip.subclip(last_end_time, segment['start_time']))
-        
-        # Add the new audio clip
-        new_audio_clip = AudioFileClip(segment['path'])
-        final_clips.append(new_audio_clip)
-        
-        last_end_time = segment['end_time']
-
-    # Add the remaining part of the original audio
-    if last_end_time < original_clip.duration:
-        final_clips.append(original_clip.subclip(last_end_time))
-
-    # Concatenate all clips to form the new audio track
-    final_audio = concatenate_audioclips(final_clips)
-    
-    new_audio_filename = f"final_audio_{project.id}.mp3"
-    new_audio_path = os.path.join("outputs", new_audio_filename)
-    final_audio.write_audiofile(new_audio_path)
-
-    # Replace audio in the original video
-    original_video_path = project.video.file_path
-    video_clip = VideoFileClip(original_video_path)
-    video_clip = video_clip.set_audio(final_audio)
-    
-    new_video_filename = f"final_video_{project.id}.mp4"
-    new_video_path = os.path.join("outputs", new_video_filename)
-    video_clip.write_videofile(new_video_path)
-
-    # Update project with new video
-    project.video.file_path = new_video_path
-    
-    # Commit all database changes (transcript updates and video path update)
-    db.commit()
-    print("Database updated with transcript changes and new video path.")
-
-    # Clean up temporary audio files
-    for file_path in temp_files:
+        print(f"Generated {len(new_audio_segments)} new audio clips for {len(changes_by_line)} modified lines.")
+
+        if not new_audio_segments:
+            # Text changes were still committed even though no audio came back
+            await commit_task
+            print("Transcript changes saved to database.")
+            print("No audio changes to apply.")
+            return {"message": "Transcript changes applied successfully (no audio generation needed)."}
+
+        # Sort segments by start time to process them in order
+        new_audio_segments.sort(key=lambda x: x['start_time'])
+
+        # Build a concat-demuxer plan: untouched spans of the original audio are
+        # referenced by inpoint/outpoint, replacement clips are included whole.
+        # ffmpeg assembles the track in one pass; nothing is decoded in Python.
+        plan = []
+        last_end_time = 0
+
+        for segment in new_audio_segments:
+            if segment['start_time'] > last_end_time:
+                plan.append((original_audio_path, last_end_time, segment['start_time']))
+            plan.append((segment['path'], None, None))
+            last_end_time = segment['end_time']
+
+        if last_end_time < audio_processor._probe_duration(original_audio_path):
+            plan.append((original_audio_path, last_end_time, None))
+
+        list_path = os.path.join("temp", f"concat_{uuid.uuid4()}.txt")
+        with open(list_path, "w") as f:
+            for src, inpoint, outpoint in plan:
+                f.write(f"file '{os.path.abspath(src)}'\n")
+                if inpoint is not None:
+                    f.write(f"inpoint {inpoint}\n")
+                if outpoint is not None:
+                    f.write(f"outpoint {outpoint}\n")
+        temp_files.append(list_path)
+
+        new_audio_filename = f"final_audio_{project_pk}.mp3"
+        new_audio_path = os.path.join("outputs", new_audio_filename)
+        new_video_filename = f"final_video_{project_pk}.mp4"
+        new_video_path = os.path.join("outputs", new_video_filename)
+
+        # One ffmpeg process writes both artifacts: the concat demuxer output
+        # is decoded once and feeds the standalone mp3 encode and the video
+        # mux (H.264 stream copied, so no video decode+encode pass). TTS clips
+        # and the extracted track aren't parameter-matched, so raw stream copy
+        # of the assembled audio isn't safe here.
+        ok = await asyncio.to_thread(
+            multi_output,
+            [
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-i", original_video_path,
+            ],
+            [
+                ["-map", "0:a:0", "-c:a", "libmp3lame", new_audio_path],
+                [
+                    "-map", "1:v:0", "-map", "0:a:0",
+                    "-c:v", "copy", "-c:a", "aac", "-shortest",
+                    new_video_path
+                ],
+            ],
+        )
+        if not ok:
+            raise Exception("Failed to assemble the edited audio and video")
+
+        # The overlapped text-edit commit must land before the session is reused
+        await commit_task
+        print("Transcript changes saved to database.")
+
+        # Update project with new video
+        project.video.file_path = new_video_path
+        db.commit()
+        print("Database updated with new video path.")
+
+        # Clean up temporary audio files
+        for file_path in temp_files:
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                print(f"Error deleting temp file {file_path}: {e}")
+
+        print(f"Successfully generated new video: {new_video_path}")
+        return {"message": "Changes applied and new video generated successfully."}
+    finally:
+        # The threaded commit must land before FastAPI's teardown can
+        # close the request-scoped session, including on the failure
+        # paths that raise before the awaits above; retrieving it here
+        # also keeps a failed commit from surfacing only as an
+        # unretrieved task exception.
         try:
-            os.remove(file_path)
-        except OSError as e:
-            print(f"Error deleting temp file {file_path}: {e}")
-
-    print(f"Successfully generated new video: {new_video_path}")
-    return {"message": "Changes applied and new video generated successfully."} 
\ No newline at end of file
+            await commit_task
+        except Exception as commit_error:
+            print(f"Error committing transcript text edits: {commit_error}")
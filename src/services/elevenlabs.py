@@ -22,33 +22,52 @@ class ElevenLabsService:
             "Content-Type": "application/json",
             "xi-api-key": self.api_key
         }
-    
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared AsyncClient: one TLS handshake, HTTP/2 multiplexing for
+        concurrent TTS calls instead of a new connection per request."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared client (call from app shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+
     async def get_voices(self) -> List[Voice]:
         """Get available voices from ElevenLabs"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/voices",
-                    headers={"xi-api-key": self.api_key}
+            client = self._get_client()
+            response = await client.get(
+                f"{self.base_url}/voices",
+                headers={"xi-api-key": self.api_key}
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            voices = []
+
+            for voice_data in data.get("voices", []):
+                voice = Voice(
+                    voice_id=voice_data["voice_id"],
+                    name=voice_data["name"],
+                    category=voice_data.get("category"),
+                    description=voice_data.get("description"),
+                    preview_url=voice_data.get("preview_url")
                 )
-                response.raise_for_status()
-                
-                data = response.json()
-                voices = []
-                
-                for voice_data in data.get("voices", []):
-                    voice = Voice(
-                        voice_id=voice_data["voice_id"],
-                        name=voice_data["name"],
-                        category=voice_data.get("category"),
-                        description=voice_data.get("description"),
-                        preview_url=voice_data.get("preview_url")
-                    )
-                    voices.append(voice)
-                
-                logger.info(f"Fetched {len(voices)} voices from ElevenLabs")
-                return voices
-                
+                voices.append(voice)
+
+            logger.info(f"Fetched {len(voices)} voices from ElevenLabs")
+            return voices
+
+
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching voices: {e}")
             return self.get_default_voices()
@@ -122,26 +141,26 @@ class ElevenLabsService:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            client = self._get_client()
+            response = await client.post(
+                f"{self.base_url}/text-to-speech/{voice_id}",
+                headers=self.headers,
+                json=request_body
+            )
+
+            if response.status_code == 429:
+                # Rate limiting - wait and retry once
+                await asyncio.sleep(2)
                 response = await client.post(
                     f"{self.base_url}/text-to-speech/{voice_id}",
                     headers=self.headers,
                     json=request_body
                 )
-                
-                if response.status_code == 429:
-                    # Rate limiting - wait and retry once
-                    await asyncio.sleep(2)
-                    response = await client.post(
-                        f"{self.base_url}/text-to-speech/{voice_id}",
-                        headers=self.headers,
-                        json=request_body
-                    )
-                
-                response.raise_for_status()
-                
-                logger.info(f"Generated speech for text length: {len(text)} characters")
-                return response.content
+
+            response.raise_for_status()
+
+            logger.info(f"Generated speech for text length: {len(text)} characters")
+            return response.content
                 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error generating speech: {e}")
@@ -153,6 +172,72 @@ class ElevenLabsService:
             logger.error(f"Error generating speech: {e}")
             raise Exception(f"TTS generation failed: {str(e)}")
     
+    async def generate_speech_stream(
+        self,
+        text: str,
+        voice_id: str,
+        out_fp,
+        model_id: str = "eleven_multilingual_v2",
+        voice_settings: Optional[VoiceSettings] = None
+    ) -> int:
+        """Generate speech and stream it into out_fp in 64 KiB chunks.
+
+        Avoids holding the full audio response in memory; returns the number
+        of bytes written.
+        """
+        try:
+            if not voice_settings:
+                voice_settings = VoiceSettings()
+
+            # Validate input
+            if not text or len(text.strip()) == 0:
+                raise ValueError("Text cannot be empty")
+
+            if len(text) > 40000:
+                raise ValueError("Text exceeds maximum length of 40,000 characters")
+
+            request_body = {
+                "text": text,
+                "model_id": model_id,
+                "voice_settings": {
+                    "stability": voice_settings.stability,
+                    "similarity_boost": voice_settings.similarity_boost,
+                    "style": voice_settings.style,
+                    "use_speaker_boost": voice_settings.use_speaker_boost,
+                    "speed": voice_settings.speed
+                }
+            }
+
+            total = 0
+            client = self._get_client()
+            for attempt in range(2):
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/text-to-speech/{voice_id}",
+                    headers=self.headers,
+                    json=request_body
+                ) as response:
+                    if response.status_code == 429 and attempt == 0:
+                        # Rate limiting - wait and retry once
+                        await asyncio.sleep(2)
+                        continue
+
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(65536):
+                        out_fp.write(chunk)
+                        total += len(chunk)
+                break
+
+            logger.info(f"Streamed speech for text length: {len(text)} characters ({total} bytes)")
+            return total
+
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error generating speech: {e}")
+            raise Exception(f"TTS generation failed: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error generating speech: {e}")
+            raise Exception(f"TTS generation failed: {str(e)}")
+
     async def generate_speech_with_retry(
         self,
         text: str,
@@ -178,4 +263,17 @@ class ElevenLabsService:
     def validate_voice_id(self, voice_id: str) -> bool:
         """Validate if voice ID exists in default voices"""
         default_voice_ids = [voice.voice_id for voice in self.get_default_voices()]
-        return voice_id in default_voice_ids 
\ No newline at end of file
+        return voice_id in default_voice_ids
+
+_shared_service: Optional[ElevenLabsService] = None
+
+def get_elevenlabs_service() -> ElevenLabsService:
+    """
+    Process-wide ElevenLabsService. Every caller shares the one persistent
+    HTTP/2 client (and its keepalive connections) instead of opening a
+    client per call; the app closes it once on shutdown.
+    """
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = ElevenLabsService()
+    return _shared_service
\ No newline at end of file
@@ -1,18 +1,80 @@
+import hashlib
 import os
-import openai
+import subprocess
+import tempfile
 from dotenv import load_dotenv
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Whisper responses cached by content hash; re-transcribing unchanged audio
+# (e.g. when applying edits needs word timestamps again) becomes a JSON read
+_WHISPER_CACHE_DIR = os.path.join("outputs", ".whisper_cache")
+
+_transcript_generator = None
+
+
+def get_transcript_generator() -> "TranscriptGenerator":
+    """
+    Lazily constructed module-level singleton.
+
+    TranscriptGenerator is stateless beyond its API-key setup, so callers
+    share one instance instead of re-running load_dotenv() per request.
+    """
+    global _transcript_generator
+    if _transcript_generator is None:
+        _transcript_generator = TranscriptGenerator()
+    return _transcript_generator
+
 class TranscriptGenerator:
     def __init__(self):
+        # openai is imported here, not at module load: its SDK import chain
+        # is heavy and only transcription paths need it
+        import openai
+
         load_dotenv()
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set.")
         openai.api_key = api_key
 
+    def _cache_key(self, audio_path: str, get_word_timestamps: bool) -> str:
+        """SHA-256 of the file content plus the requested granularity."""
+        digest = hashlib.sha256()
+        with open(audio_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}_{'words' if get_word_timestamps else 'segments'}"
+
+    def _prepare_audio(self, audio_path: str) -> str:
+        """
+        Downmix the audio to 16 kHz mono before uploading it.
+
+        Whisper resamples everything to 16 kHz mono internally, so sending
+        richer audio only inflates the upload and the API-side decode. Returns
+        the original path unchanged if ffmpeg is unavailable or fails.
+        """
+        tmp = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
+        tmp.close()
+        cmd = [
+            "ffmpeg", "-y",
+            "-i", audio_path,
+            "-ac", "1",
+            "-ar", "16000",
+            "-b:a", "48k",
+            tmp.name
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+            return tmp.name
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not downmix audio for transcription, sending original: {e}")
+            try:
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+            return audio_path
+
     def generate_transcript(self, audio_path: str, get_word_timestamps: bool = False):
         """
         Generates a transcript for an audio file using OpenAI's Whisper API.
@@ -24,12 +86,34 @@ class TranscriptGenerator:
         Returns:
             OpenAI transcript object with segments containing start, end, and text.
         """
+        import openai
+        from openai.types.audio import TranscriptionVerbose
+
         if not os.path.exists(audio_path):
             logger.error(f"Audio file not found at {audio_path}")
             return None
 
+        # Serve identical audio from the on-disk cache instead of re-uploading
         try:
-            with open(audio_path, "rb") as audio_file:
+            cache_key = self._cache_key(audio_path, get_word_timestamps)
+        except OSError:
+            cache_key = None
+
+        cache_file = None
+        if cache_key:
+            cache_file = os.path.join(_WHISPER_CACHE_DIR, f"{cache_key}.json")
+            if os.path.exists(cache_file):
+                try:
+                    with open(cache_file, "r") as f:
+                        cached = TranscriptionVerbose.model_validate_json(f.read())
+                    logger.info(f"Using cached Whisper transcript for {audio_path}")
+                    return cached
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable Whisper cache entry: {e}")
+
+        prepared_path = self._prepare_audio(audio_path)
+        try:
+            with open(prepared_path, "rb") as audio_file:
                 logger.info("Generating transcript with OpenAI Whisper...")
                 
                 # Always request verbose_json to get segment timestamps
@@ -67,9 +151,23 @@ class TranscriptGenerator:
                     except Exception as e:
                         logger.error(f"Error logging segment {i}: {e}")
                         logger.error(f"Segment content: {segment}")
-            
+
+            if cache_file:
+                try:
+                    os.makedirs(_WHISPER_CACHE_DIR, exist_ok=True)
+                    with open(cache_file, "w") as f:
+                        f.write(transcript.model_dump_json())
+                except (OSError, AttributeError) as e:
+                    logger.warning(f"Could not cache Whisper transcript: {e}")
+
             return transcript
 
         except Exception as e:
             logger.error(f"Error during transcript generation: {e}")
-            return None 
\ No newline at end of file
+            return None
+        finally:
+            if prepared_path != audio_path:
+                try:
+                    os.unlink(prepared_path)
+                except OSError:
+                    pass
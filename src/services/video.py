@@ -1,10 +1,168 @@
 import argparse
+import asyncio
+import functools
+import json
 import os
 import subprocess
+import tempfile
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bound on concurrent ffmpeg children: bursts of jobs queue here instead of
+# oversubscribing the CPU and time-slicing every decode. Tunable per
+# deployment via FFMPEG_CONCURRENCY.
+_FFMPEG_CONCURRENCY = int(os.getenv("FFMPEG_CONCURRENCY", os.cpu_count() or 1))
+_FFMPEG_SEM = asyncio.Semaphore(_FFMPEG_CONCURRENCY)
+
+async def _run_ffmpeg_async(command, input_bytes=None):
+    """
+    Run an ffmpeg argv without blocking the event loop, gated by the
+    module-wide concurrency bound.
+
+    Returns (returncode, stderr_text); raises FileNotFoundError when the
+    ffmpeg binary is missing, mirroring subprocess.run.
+    """
+    async with _FFMPEG_SEM:
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if input_bytes is not None else None,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate(input=input_bytes)
+        return proc.returncode, stderr.decode(errors='replace')
+
+def _run_ffmpeg(command, input_bytes=None):
+    """
+    Run ffmpeg with stdout discarded and stderr kept only for errors, so
+    chatty encodes don't accumulate megabytes of progress text in RAM.
+    Raises CalledProcessError (with .stderr) on failure like check=True.
+    """
+    return subprocess.run(
+        command,
+        input=input_bytes,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=input_bytes is None,
+        check=True
+    )
+
+# Invariant argv fragments, built once at import instead of as fresh
+# string lists on every call; hot batch paths just splice these tuples
+_FFMPEG_BASE = ('ffmpeg', '-v', 'error', '-y')
+_THUMB_OUTPUT_ARGS = ('-frames:v', '1', '-an', '-q:v', '2', '-vf', 'scale=320:240')
+
+# Output directories already created this process; repeat calls for the
+# same thumbnail/output dir skip the mkdir syscalls entirely
+_MADE_DIRS = set()
+_MADE_DIRS_LOCK = threading.Lock()
+
+def _ensure_dir(path):
+    """os.makedirs(exist_ok=True), memoized per process."""
+    if not path or path in _MADE_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    with _MADE_DIRS_LOCK:
+        _MADE_DIRS.add(path)
+
+# Hardware decode methods, best first; probed once and persisted so
+# restarts don't re-negotiate
+_HWACCEL_PREFERENCE = ("cuda", "videotoolbox", "vaapi", "qsv")
+_HWACCEL_CACHE_FILE = os.path.join(tempfile.gettempdir(), "ffmpeg_hwaccel.json")
+_hwaccel_probed = False
+_hwaccel = None
+
+def _detect_hwaccel():
+    """Return the preferred hwaccel method, or None for software decode."""
+    global _hwaccel_probed, _hwaccel
+    if _hwaccel_probed:
+        return _hwaccel
+
+    try:
+        with open(_HWACCEL_CACHE_FILE) as f:
+            _hwaccel = json.load(f).get("hwaccel")
+        _hwaccel_probed = True
+        return _hwaccel
+    except (OSError, ValueError):
+        pass
+
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True, text=True, check=True
+        )
+        available = result.stdout.split()
+    except (OSError, subprocess.CalledProcessError):
+        available = []
+
+    _hwaccel = next((m for m in _HWACCEL_PREFERENCE if m in available), None)
+    _hwaccel_probed = True
+    try:
+        with open(_HWACCEL_CACHE_FILE, "w") as f:
+            json.dump({"hwaccel": _hwaccel}, f)
+    except OSError:
+        pass
+    return _hwaccel
+
+def _hwaccel_args():
+    """Input options selecting the cached hardware decoder, if any."""
+    method = _detect_hwaccel()
+    return ["-hwaccel", method] if method else []
+
+@functools.lru_cache(maxsize=512)
+def _probe(path, size, mtime):
+    """ffprobe stream metadata; (size, mtime) in the key invalidate edits."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-print_format", "json", "-show_streams", path],
+            capture_output=True, text=True, check=True
+        )
+        return json.loads(result.stdout)
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError):
+        return None
+
+def probe_streams(path, st=None):
+    """Cached stream probe for a file, keyed by (path, size, mtime).
+
+    Callers that already hold an os.stat result pass it as `st` so the
+    lookup costs no extra syscall.
+    """
+    if st is None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+    return _probe(path, st.st_size, st.st_mtime)
+
+def _fast_probe_args(video_path, st=None):
+    """
+    Input options that skip ffmpeg's long stream analysis when a cached
+    probe already identified the video stream; empty when unknown.
+    """
+    probe = probe_streams(video_path, st)
+    if probe and any(s.get("codec_type") == "video" for s in probe.get("streams", [])):
+        return ["-probesize", "32k", "-analyzeduration", "0"]
+    return []
+
+def _audio_codec_args(audio_path, output_path):
+    """
+    Output options for the audio leg of a mux: stream copy when the source
+    codec already fits the target container, otherwise one fixed-quality
+    AAC encode (no default-codec probing).
+    """
+    probe = probe_streams(audio_path)
+    codec = None
+    if probe:
+        codec = next(
+            (s.get("codec_name") for s in probe.get("streams", []) if s.get("codec_type") == "audio"),
+            None
+        )
+    if codec in ('aac', 'mp3') and output_path.lower().endswith(('.mp4', '.mkv', '.mov')):
+        return ['-c:a', 'copy']
+    return ['-c:a', 'aac', '-b:a', '128k']
+
 class VideoAudioReplacer:
     @staticmethod
     def replace_audio(video_path, audio_path, output_path):
@@ -13,6 +171,18 @@ class VideoAudioReplacer:
         """
         return replace_video_audio(video_path, audio_path, output_path)
 
+    @staticmethod
+    def replace_audio_and_thumbnail(video_path, audio_path, output_path, thumbnail_path, time_offset="00:00:00"):
+        """
+        Produces the audio-swapped video and the thumbnail in one ffmpeg
+        invocation; falls back to the two single-output calls on failure.
+        """
+        if process_video(video_path, audio_path, output_path, thumbnail_path, time_offset):
+            return output_path
+        replace_video_audio(video_path, audio_path, output_path)
+        generate_video_thumbnail(video_path, thumbnail_path, time_offset)
+        return output_path
+
     @staticmethod
     def generate_thumbnail(video_path, output_path, time_offset="00:00:00"):
         """
@@ -28,6 +198,13 @@ class VideoAudioReplacer:
         """
         return generate_video_thumbnail(video_path, output_path, time_offset)
 
+    @staticmethod
+    def generate_thumbnails(video_path, time_offsets, output_dir):
+        """
+        Generates thumbnails at multiple offsets in one ffmpeg invocation.
+        """
+        return generate_thumbnails_batch(video_path, time_offsets, output_dir)
+
 def generate_video_thumbnail(video_path, output_path, time_offset="00:00:00"):
     """
     Generates a thumbnail image from a video file using ffmpeg.
@@ -40,29 +217,126 @@ def generate_video_thumbnail(video_path, output_path, time_offset="00:00:00"):
     Returns:
         str: Path to the generated thumbnail or None if failed
     """
-    if not os.path.exists(video_path):
+    # One stat both validates the input and keys the probe cache
+    try:
+        st = os.stat(video_path)
+    except OSError:
         logger.error(f"Video file not found at {video_path}")
         return None
 
     try:
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
+        _ensure_dir(os.path.dirname(output_path))
+
         command = [
-            'ffmpeg',
-            '-y',  # Overwrite output file if it exists
+            *_FFMPEG_BASE,
+            *_fast_probe_args(video_path, st),
+            *_hwaccel_args(),
+            '-ss', time_offset,  # Seek before -i: keyframe jump, no decode-to-offset
+            '-noaccurate_seek',  # Nearest keyframe is fine for a thumbnail
             '-i', video_path,
-            '-ss', time_offset,  # Seek to time offset
-            '-vframes', '1',  # Extract only one frame
-            '-q:v', '2',  # High quality
-            '-vf', 'scale=320:240',  # Resize to thumbnail size
+            *_THUMB_OUTPUT_ARGS,
             output_path
         ]
-        
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
+
+        _run_ffmpeg(command)
+        logger.info(f"✅ Thumbnail generated successfully and saved to {output_path}")
+        return output_path
+
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return None
+    except subprocess.CalledProcessError as e:
+        logger.error(f"An error occurred with ffmpeg: {e.stderr}")
+        return None
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return None
+
+async def generate_video_thumbnail_async(video_path, output_path, time_offset="00:00:00"):
+    """
+    Async variant of generate_video_thumbnail; the ffmpeg process runs via
+    asyncio so awaiting handlers don't stall the event loop.
+    """
+    # One stat both validates the input and keys the probe cache
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        logger.error(f"Video file not found at {video_path}")
+        return None
+
+    try:
+        _ensure_dir(os.path.dirname(output_path))
+
+        command = [
+            *_FFMPEG_BASE,
+            *_fast_probe_args(video_path, st),
+            *_hwaccel_args(),
+            '-ss', time_offset,
+            '-noaccurate_seek',
+            '-i', video_path,
+            *_THUMB_OUTPUT_ARGS,
+            output_path
+        ]
+
+        returncode, stderr = await _run_ffmpeg_async(command)
+        if returncode != 0:
+            logger.error(f"An error occurred with ffmpeg: {stderr}")
+            return None
         logger.info(f"✅ Thumbnail generated successfully and saved to {output_path}")
         return output_path
 
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return None
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return None
+
+def generate_thumbnails_batch(video_path, time_offsets, output_dir):
+    """
+    Extracts thumbnails at several offsets with a single ffmpeg process.
+
+    One invocation pays process startup and codec registration once for
+    the whole filmstrip instead of once per frame; each offset gets its
+    own seeked input and output group.
+
+    Args:
+        video_path (str): The path to the input video file.
+        time_offsets (list): Offsets (ffmpeg time syntax) to grab frames at.
+        output_dir (str): Directory to write thumb_NNN.jpg files into.
+
+    Returns:
+        list: Paths of the generated thumbnails, or None if failed.
+    """
+    # One stat both validates the input and keys the probe cache
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        logger.error(f"Video file not found at {video_path}")
+        return None
+    if not time_offsets:
+        return []
+
+    try:
+        _ensure_dir(output_dir)
+
+        fast_args = _fast_probe_args(video_path, st)
+        hw_args = _hwaccel_args()
+        command = [*_FFMPEG_BASE]
+        for offset in time_offsets:
+            command += [*fast_args, *hw_args, '-ss', str(offset), '-noaccurate_seek', '-i', video_path]
+
+        output_paths = []
+        for index in range(len(time_offsets)):
+            out_path = os.path.join(output_dir, f"thumb_{index:03d}.jpg")
+            output_paths.append(out_path)
+            command += ['-map', f'{index}:v:0', *_THUMB_OUTPUT_ARGS, out_path]
+
+        _run_ffmpeg(command)
+        logger.info(f"✅ Generated {len(output_paths)} thumbnails in {output_dir}")
+        return output_paths
+
     except FileNotFoundError:
         logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
         return None
@@ -73,6 +347,93 @@ def generate_video_thumbnail(video_path, output_path, time_offset="00:00:00"):
         logger.error(f"An error occurred: {e}")
         return None
 
+def process_video(video_path, audio_path, output_video_path, thumbnail_path, time_offset="00:00:00"):
+    """
+    Replaces a video's audio and generates its thumbnail with one ffmpeg
+    invocation: the input is opened and demuxed once and both outputs are
+    written from the same pass, instead of spawning a process per output.
+
+    Args:
+        video_path (str): The path to the input video file.
+        audio_path (str): The path to the new audio file.
+        output_video_path (str): Where to save the video with swapped audio.
+        thumbnail_path (str): Where to save the thumbnail image.
+        time_offset (str): Time offset to extract the thumbnail frame from.
+
+    Returns:
+        bool: True if both outputs were produced.
+    """
+    try:
+        _ensure_dir(os.path.dirname(thumbnail_path))
+
+        command = [
+            *_FFMPEG_BASE,
+            '-i', video_path,
+            '-i', audio_path,
+            # Output 1: muxed video, H.264 stream copied as-is
+            '-map', '0:v:0',
+            '-map', '1:a:0',
+            '-c:v', 'copy',
+            '-shortest',
+            output_video_path,
+            # Output 2: thumbnail still (-ss as an output option so the
+            # seek doesn't trim the muxed video above)
+            '-map', '0:v:0',
+            '-ss', time_offset,
+            *_THUMB_OUTPUT_ARGS,
+            thumbnail_path
+        ]
+
+        _run_ffmpeg(command)
+        logger.info(f"✅ Audio replaced and thumbnail generated: {output_video_path}, {thumbnail_path}")
+        return True
+
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return False
+    except subprocess.CalledProcessError as e:
+        logger.error(f"An error occurred with ffmpeg: {e.stderr}")
+        return False
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return False
+
+def multi_output(input_args, outputs):
+    """
+    Produces several outputs from a single ffmpeg invocation.
+
+    Every input is opened and decoded once and feeds all outputs that -map
+    it, instead of spawning one process (and one demux pass) per artifact.
+    No asplit filter graph is needed for plain stream fan-out: ffmpeg lets
+    multiple outputs map the same input stream directly.
+
+    Args:
+        input_args (list): Flat input options, e.g.
+            ['-f', 'concat', '-safe', '0', '-i', list_path, '-i', video_path].
+        outputs (list): One flat option list per output, each ending with
+            its output path, e.g.
+            [['-map', '0:a:0', '-c:a', 'libmp3lame', audio_out], ...].
+
+    Returns:
+        bool: True if all outputs were produced.
+    """
+    command = [*_FFMPEG_BASE, *input_args]
+    for output_args in outputs:
+        command += output_args
+
+    try:
+        _run_ffmpeg(command)
+        return True
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return False
+    except subprocess.CalledProcessError as e:
+        logger.error(f"An error occurred with ffmpeg: {e.stderr}")
+        return False
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return False
+
 def replace_video_audio(video_path, audio_path, output_path):
     """
     Replaces the audio of a video file with a new one using ffmpeg.
@@ -82,37 +443,137 @@ def replace_video_audio(video_path, audio_path, output_path):
         audio_path (str): The path to the new audio file.
         output_path (str): The path to save the output video file.
     """
-    if not os.path.exists(video_path):
-        print(f"Error: Video file not found at {video_path}")
-        return
-
-    if not os.path.exists(audio_path):
-        print(f"Error: Audio file not found at {audio_path}")
-        return
-
+    # No stat-before-open probes: ffmpeg reports missing inputs itself and
+    # the except below surfaces its message
     try:
         command = [
-            'ffmpeg',
-            '-y',  # Overwrite output file if it exists
+            *_FFMPEG_BASE,
+            *_fast_probe_args(video_path),
             '-i', video_path,
             '-i', audio_path,
             '-c:v', 'copy',
+            *_audio_codec_args(audio_path, output_path),
             '-map', '0:v:0',
             '-map', '1:a:0',
             '-shortest',
+            # moov atom up front so browsers can start playback while the
+            # file is still downloading
+            '-movflags', '+faststart',
             output_path
         ]
-        
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        print(f"✅ Audio replaced successfully and saved to {output_path}")
+
+        _run_ffmpeg(command)
+        logger.info(f"✅ Audio replaced successfully and saved to {output_path}")
 
     except FileNotFoundError:
-        print("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+    except subprocess.CalledProcessError as e:
+        logger.error(f"An error occurred with ffmpeg: {e.stderr}")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+
+async def replace_video_audio_async(video_path, audio_path, output_path):
+    """
+    Async variant of replace_video_audio; concurrent muxes run side by side
+    instead of serializing on the event loop thread.
+    """
+    command = [
+        *_FFMPEG_BASE,
+        *_fast_probe_args(video_path),
+        '-i', video_path,
+        '-i', audio_path,
+        '-c:v', 'copy',
+        *_audio_codec_args(audio_path, output_path),
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-shortest',
+        '-movflags', '+faststart',
+        output_path
+    ]
+
+    try:
+        returncode, stderr = await _run_ffmpeg_async(command)
+        if returncode != 0:
+            logger.error(f"An error occurred with ffmpeg: {stderr}")
+            return None
+        logger.info(f"✅ Audio replaced successfully and saved to {output_path}")
+        return output_path
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return None
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return None
+
+def replace_video_audio_from_bytes(video_path, audio_bytes, output_path):
+    """
+    Replaces the audio of a video file with in-memory audio bytes.
+
+    The audio is fed to ffmpeg over stdin, so a just-generated clip never
+    has to be written out and read back purely for the mux.
+
+    Args:
+        video_path (str): The path to the input video file.
+        audio_bytes (bytes): The new audio track, e.g. fresh TTS output.
+        output_path (str): The path to save the output video file.
+
+    Returns:
+        str: The output path, or None if the mux failed.
+    """
+    command = [
+        *_FFMPEG_BASE,
+        '-i', video_path,
+        '-i', 'pipe:0',
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-shortest',
+        output_path
+    ]
+
+    try:
+        _run_ffmpeg(command, input_bytes=audio_bytes)
+        logger.info(f"✅ Audio replaced successfully and saved to {output_path}")
+        return output_path
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return None
     except subprocess.CalledProcessError as e:
-        print(f"An error occurred with ffmpeg:")
-        print(e.stderr)
+        logger.error(f"An error occurred with ffmpeg: {e.stderr.decode(errors='replace')}")
+        return None
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return None
+
+async def replace_video_audio_from_bytes_async(video_path, audio_bytes, output_path):
+    """
+    Async variant of replace_video_audio_from_bytes; the audio still goes to
+    ffmpeg over stdin, but the mux no longer blocks the event loop.
+    """
+    command = [
+        *_FFMPEG_BASE,
+        '-i', video_path,
+        '-i', 'pipe:0',
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-shortest',
+        output_path
+    ]
+
+    try:
+        returncode, stderr = await _run_ffmpeg_async(command, input_bytes=audio_bytes)
+        if returncode != 0:
+            logger.error(f"An error occurred with ffmpeg: {stderr}")
+            return None
+        logger.info(f"✅ Audio replaced successfully and saved to {output_path}")
+        return output_path
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install ffmpeg.")
+        return None
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
+        return None
 
 if __name__ == "__main__":
     output_path = "src/video/video_with_new_audio_1750541337.mp4"
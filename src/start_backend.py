@@ -5,28 +5,30 @@ Audio Editor Backend Startup Script
 
 import os
 import sys
-import uvicorn
-from dotenv import load_dotenv
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.exc import OperationalError
 
-# Load environment variables from .env file in the project root
+# Heavy imports (uvicorn, sqlalchemy, dotenv, core.config) are deferred to
+# the functions that use them so importing this module stays cheap for
+# tools and test collection.
+
+# Path to the .env file in the project root
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-load_dotenv(dotenv_path=dotenv_path)
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.config import config
-
 # List of required tables
 REQUIRED_TABLES = {
     'users', 'projects', 'videos', 'audio_files',
-    'audio_segments', 'transcription_lines', 'edit_requests'
+    'audio_segments', 'transcription_lines', 'edit_requests',
+    'uploaded_assets'
 }
 
 def run_health_checks():
     """Performs all pre-startup health checks."""
+    from sqlalchemy import create_engine, inspect, text
+    from sqlalchemy.exc import OperationalError
+    from core.config import config
+
     print("--- Running Pre-startup Health Checks ---")
     
     # 1. Check Database Connection & Tables
@@ -41,9 +43,21 @@ def run_health_checks():
         with engine.connect() as connection:
             print("✅ Database connection successful.")
             
-            # 2. Check for required tables
-            inspector = inspect(engine)
-            existing_tables = set(inspector.get_table_names())
+            # 2. Check for required tables with one catalog query; the
+            # Inspector issues several metadata round-trips for the same set
+            dialect = engine.dialect.name
+            if dialect == "postgresql":
+                rows = connection.execute(
+                    text("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()")
+                )
+                existing_tables = {row[0] for row in rows}
+            elif dialect == "sqlite":
+                rows = connection.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table'")
+                )
+                existing_tables = {row[0] for row in rows}
+            else:
+                existing_tables = set(inspect(engine).get_table_names())
             missing_tables = REQUIRED_TABLES - existing_tables
             
             if missing_tables:
@@ -72,7 +86,13 @@ def run_health_checks():
 
 def main():
     """Start the FastAPI server"""
-    
+    import uvicorn
+    from dotenv import load_dotenv
+
+    # Load environment variables before core.config reads them
+    load_dotenv(dotenv_path=dotenv_path)
+    from core.config import config
+
     # Run pre-startup checks
     run_health_checks()
     
@@ -81,21 +101,32 @@ def main():
     print(f"🌐 Server: http://{config.HOST}:{config.PORT}")
     print(f"📋 API Docs: http://{config.HOST}:{config.PORT}/docs")
     
-    # Create necessary directories
+    # Create necessary directories; exist_ok folds the exists+mkdir pair
+    # into one syscall and removes the check/create race
     directories = [config.TEMP_DIR, config.UPLOAD_DIR, config.OUTPUT_DIR]
     for directory in directories:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            print(f"📁 Created directory: {directory}")
+        os.makedirs(directory, exist_ok=True)
     
-    # Start the server
-    uvicorn.run(
-        "main:app",
-        host=config.HOST,
-        port=config.PORT,
-        reload=config.DEBUG,
-        log_level="info" if config.DEBUG else "warning"
-    )
+    # Start the server. BACKEND_UDS switches to a Unix domain socket for
+    # same-host clients, skipping the TCP loopback stack entirely; uvicorn
+    # binds one listener per process, so the socket replaces TCP when set.
+    uds_path = os.getenv("BACKEND_UDS")
+    if uds_path:
+        print(f"🔌 Listening on Unix socket: {uds_path}")
+        uvicorn.run(
+            "main:app",
+            uds=uds_path,
+            reload=config.DEBUG,
+            log_level="info" if config.DEBUG else "warning"
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host=config.HOST,
+            port=config.PORT,
+            reload=config.DEBUG,
+            log_level="info" if config.DEBUG else "warning"
+        )
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
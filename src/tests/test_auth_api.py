@@ -4,9 +4,18 @@ import time
 import subprocess
 import requests
 import uuid
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- Configuration ---
 BASE_URL = "http://localhost:8000"
+
+# One pooled session for the whole suite: the TCP+TLS handshake is paid once
+# and every call after that reuses the warm connection
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=2))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
 # Ensure the script can find the project's root and source directories
 PROJ_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(PROJ_ROOT)
@@ -36,9 +45,20 @@ def start_backend():
     try:
         process = subprocess.Popen(command, cwd=PROJ_ROOT, preexec_fn=os.setsid)
         print_status("Backend server process started.")
-        # Give the server a moment to start up
-        time.sleep(5)
-        return process
+        # Poll the health endpoint instead of sleeping a fixed 5s: the suite
+        # proceeds the moment the server answers, and fails fast if it never does
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(f"{BASE_URL}/", timeout=0.25).ok:
+                    print_status("Backend server is ready.")
+                    return process
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.1)
+        print_status("Backend server did not become ready in time.", success=False)
+        stop_backend(process)
+        sys.exit(1)
     except Exception as e:
         print_status(f"Failed to start backend server: {e}", success=False)
         sys.exit(1)
@@ -64,10 +84,10 @@ def test_register_user():
     }
     
     try:
-        response = requests.post(url, json=payload)
+        response = SESSION.post(url, json=payload)
         response.raise_for_status()
         response_data = response.json()
-        
+
         print_status("Registration request successful.")
 
         assert "data" in response_data, "Response missing 'data' key"
@@ -91,7 +111,7 @@ def test_login_user():
     payload = {"email": TEST_EMAIL, "password": TEST_PASSWORD}
 
     try:
-        response = requests.post(url, json=payload)
+        response = SESSION.post(url, json=payload)
         response.raise_for_status()
         response_data = response.json()
 
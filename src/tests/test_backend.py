@@ -3,8 +3,8 @@
 Simple Backend Test Script
 """
 
-import os
-import requests
+import asyncio
+import httpx
 import json
 from pathlib import Path
 import uuid
@@ -23,14 +23,14 @@ def generate_random_user():
         "last_name": "User"
     }
 
-def test_auth_flow():
+async def test_auth_flow(client):
     """Tests the complete authentication flow: register, login, access protected route"""
     print("\n--- Testing Authentication ---")
     user_credentials = generate_random_user()
-    
+
     # 1. Register User
     try:
-        response = requests.post(f"{BASE_URL}/auth/register", json=user_credentials)
+        response = await client.post("/auth/register", json=user_credentials)
         if response.status_code == 200:
             print("✅ Registration Successful")
         else:
@@ -43,7 +43,7 @@ def test_auth_flow():
     # 2. Login User
     try:
         login_data = {"email": user_credentials["email"], "password": user_credentials["password"]}
-        response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
+        response = await client.post("/auth/login", json=login_data)
         if response.status_code == 200:
             result = response.json()
             token = result.get("data", {}).get("token")
@@ -58,11 +58,11 @@ def test_auth_flow():
     except Exception as e:
         print(f"❌ Login Test Failed: {e}")
         return False
-        
+
     # 3. Access Protected Route (/users/me)
     try:
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/users/me", headers=headers)
+        response = await client.get("/users/me", headers=headers)
         if response.status_code == 200:
             print("✅ Access to Protected Route Successful")
             user_info = response.json().get('data', {})
@@ -73,24 +73,24 @@ def test_auth_flow():
     except Exception as e:
         print(f"❌ Protected Route Test Failed: {e}")
         return False
-        
+
     print("--- Authentication Test Passed ---")
     return True
 
-def test_health_check():
+async def test_health_check(client):
     """Test if backend is running"""
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = await client.get("/")
         print(f"✅ Health Check: {response.json()}")
         return True
     except Exception as e:
         print(f"❌ Health Check Failed: {e}")
         return False
 
-def test_voices():
+async def test_voices(client):
     """Test voices endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/voices")
+        response = await client.get("/voices")
         if response.status_code == 200:
             voices = response.json()["voices"]
             print(f"✅ Voices Retrieved: {len(voices)} voices available")
@@ -104,7 +104,7 @@ def test_voices():
         print(f"❌ Voices Test Failed: {e}")
         return False
 
-def test_file_upload():
+async def test_file_upload(client):
     """Test file upload with a sample audio file"""
     try:
         # Check if test file exists
@@ -112,11 +112,11 @@ def test_file_upload():
         if not test_file.exists():
             print("⚠️  Test audio file not found - skipping upload test")
             return True
-        
+
         with open(test_file, "rb") as f:
             files = {"file": ("test_audio.mp3", f, "audio/mp3")}
-            response = requests.post(f"{BASE_URL}/upload", files=files)
-        
+            response = await client.post("/upload", files=files)
+
         if response.status_code == 200:
             result = response.json()
             print(f"✅ File Upload: {result['original_name']} uploaded successfully")
@@ -130,14 +130,14 @@ def test_file_upload():
         print(f"❌ Upload Test Failed: {e}")
         return None
 
-def test_waveform(file_id):
+async def test_waveform(client, file_id):
     """Test waveform generation"""
     if not file_id:
         print("⚠️  No file ID - skipping waveform test")
         return False
-    
+
     try:
-        response = requests.get(f"{BASE_URL}/waveform/{file_id}")
+        response = await client.get(f"/waveform/{file_id}")
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Waveform Generated: {len(result['waveform_data'])} data points")
@@ -149,15 +149,15 @@ def test_waveform(file_id):
         print(f"❌ Waveform Test Failed: {e}")
         return False
 
-def test_text_to_speech():
+async def test_text_to_speech(client):
     """Test TTS generation"""
     try:
         tts_data = {
             "text": "Hello, this is a test of the ElevenLabs text to speech API integration."
             # voice_id will be set from config automatically
         }
-        
-        response = requests.post(f"{BASE_URL}/text-to-speech", json=tts_data)
+
+        response = await client.post("/text-to-speech", json=tts_data)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ TTS Generated: {result['duration']:.2f}s audio created")
@@ -179,49 +179,50 @@ def test_voice_id_config():
         sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         from core.config import config
         print(f"✅ Voice ID Configuration: {config.VOICE_ID}")
-        
+
         # Test that it's not the hardcoded value (unless explicitly set)
         if config.VOICE_ID == "nPczCjzI2devNBz1zQrb":
             print("   Using default Rachel voice (nPczCjzI2devNBz1zQrb)")
         else:
             print(f"   Using custom voice: {config.VOICE_ID}")
-        
+
         return True
     except Exception as e:
         print(f"❌ Voice ID Config Test Failed: {e}")
         return False
 
-def run_all_tests():
+async def _upload_then_waveform(client):
+    """Upload feeds waveform, so these two stay sequential."""
+    file_id = await test_file_upload(client)
+    await test_waveform(client, file_id)
+    return file_id
+
+async def run_all_tests():
     """Run all backend tests"""
     print("🧪 Starting Backend Tests...")
     print("=" * 50)
-    
-    # Test 1: Health Check
-    if not test_health_check():
-        print("❌ Backend is not running. Please start with 'make dev-backend'")
-        return
-    
-    # Test 2: Voice ID Configuration
-    test_voice_id_config()
-    
-    # Test 3: Authentication
-    test_auth_flow()
-    
-    # Test 4: Voices
-    test_voices()
-    
-    # Test 5: File Upload
-    file_id = test_file_upload()
-    
-    # Test 6: Waveform
-    test_waveform(file_id)
-    
-    # Test 7: Text-to-Speech
-    tts_id = test_text_to_speech()
-    
+
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0) as client:
+        # Test 1: Health Check (gates everything else)
+        if not await test_health_check(client):
+            print("❌ Backend is not running. Please start with 'make dev-backend'")
+            return
+
+        # Test 2: Voice ID Configuration (local, no HTTP)
+        test_voice_id_config()
+
+        # Remaining probes are independent of each other, so they overlap
+        # their round-trips; only upload → waveform stays ordered
+        _, _, file_id, tts_id = await asyncio.gather(
+            test_auth_flow(client),
+            test_voices(client),
+            _upload_then_waveform(client),
+            test_text_to_speech(client),
+        )
+
     print("=" * 50)
     print("🎉 Backend Tests Completed!")
-    
+
     if file_id and tts_id:
         print("\n🔧 Next steps for full testing:")
         print(f"   - Test segment replacement with file_id: {file_id}")
@@ -229,4 +230,4 @@ def run_all_tests():
         print("   - Try the frontend integration")
 
 if __name__ == "__main__":
-    run_all_tests() 
\ No newline at end of file
+    asyncio.run(run_all_tests())
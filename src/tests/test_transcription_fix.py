@@ -3,76 +3,293 @@
 Test script to verify transcription timestamp fixes
 """
 
-import requests
+import asyncio
+import httpx
+import numpy as np
+import orjson
 import json
+import os
+import sys
 import time
+from itertools import islice
 
-BASE_URL = "http://localhost:8000"
-
-def test_transcription_timestamps():
-    """Test that transcription API returns proper timestamps"""
-    print("\n🧪 Testing Transcription Timestamp Fix...")
-    
-    # You'll need to replace these with actual values from your system
-    PROJECT_ID = "YOUR_PROJECT_ID_HERE"  # Replace with actual project ID
-    TOKEN = "YOUR_AUTH_TOKEN_HERE"      # Replace with actual auth token
-    
-    if PROJECT_ID == "YOUR_PROJECT_ID_HERE" or TOKEN == "YOUR_AUTH_TOKEN_HERE":
-        print("❌ Please update the test script with actual PROJECT_ID and TOKEN")
-        print("   1. Create a project and get its ID")
-        print("   2. Login and get an auth token")
-        print("   3. Update this script with those values")
+# Literal loopback address: every request skips the getaddrinfo call that
+# resolving "localhost" costs per connection
+BASE_URL = "http://127.0.0.1:8000"
+
+# You'll need to replace these with actual values from your system
+PROJECT_IDS = ["YOUR_PROJECT_ID_HERE"]  # Replace with actual project IDs
+TOKEN = "YOUR_AUTH_TOKEN_HERE"          # Replace with actual auth token
+
+# Per-segment prints cost more than the checks themselves on long
+# transcripts; set TRANSCRIPT_TEST_VERBOSE=0 for a silent pass/fail run
+# (e.g. on CI, where stdout is a pipe and every flush stalls the process)
+VERBOSE = os.environ.get("TRANSCRIPT_TEST_VERBOSE", "1") == "1"
+
+# --count-only swaps the full transcript fetch for the ~200-byte
+# /transcripts/meta summary; the whole check becomes one tiny round-trip
+COUNT_ONLY = "--count-only" in sys.argv
+
+# Conditional-GET cache: repeated dev-loop runs against an unchanged
+# transcript send If-None-Match and get a ~zero-byte 304 back instead of
+# re-downloading the whole payload
+CACHE_DIR = ".cache"
+
+# Shared read-only fallbacks: .get(key, {}) builds a fresh dict/list per
+# call even when the key exists, these never allocate. Never mutated.
+EMPTY_DICT = {}
+EMPTY_LIST = []
+
+# Compiled once; %-formatting against a constant template skips the
+# per-iteration f-string build in the segment loop
+SEGMENT_TEMPLATE = "   Segment %d: start=%s, end=%s, text='%s...'"
+
+async def fetch_with_etag_cache(client, url):
+    """GET url, reusing a cached body via If-None-Match when unchanged.
+
+    Returns (status_code, body_bytes); on 304 the body comes from disk.
+    """
+    cache_name = url.rsplit("/projects/", 1)[-1]
+    for ch in "/?=:,":
+        cache_name = cache_name.replace(ch, "-")
+    cache_path = os.path.join(CACHE_DIR, cache_name + ".json")
+    etag_path = cache_path + ".etag"
+
+    headers = {}
+    try:
+        with open(etag_path) as f:
+            headers["If-None-Match"] = f.read().strip()
+    except OSError:
+        pass
+
+    response = await client.get(url, headers=headers)
+
+    if response.status_code == 304:
+        with open(cache_path, "rb") as f:
+            return 200, f.read()
+
+    if response.status_code == 200 and response.headers.get("ETag"):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            f.write(response.content)
+        with open(etag_path, "w") as f:
+            f.write(response.headers["ETag"])
+
+    return response.status_code, response.content
+
+def probe_timestamps_bytes(body):
+    """Answers "are all timestamps present?" from the raw response bytes.
+
+    bytes.count is a vectorized C scan, so the pass/fail verdict costs
+    microseconds where a full JSON parse of a large transcript costs
+    milliseconds. Both jsonb's "key": value spacing and compact output
+    are matched.
+    """
+    total = body.count(b'"startTime"')
+    missing = (
+        body.count(b'"startTime":null') + body.count(b'"startTime": null')
+        + body.count(b'"endTime":null') + body.count(b'"endTime": null')
+    )
+    return total > 0 and missing == 0
+
+def count_missing_timestamps(segments):
+    """Counts segments missing startTime or endTime in one vectorized pass.
+
+    The comparisons run as C loops over object arrays, so the full list is
+    validated without a Python-level branch per segment.
+    """
+    n = len(segments)
+    starts = np.fromiter((s.get("startTime") for s in segments), dtype=object, count=n)
+    ends = np.fromiter((s.get("endTime") for s in segments), dtype=object, count=n)
+    return int(np.count_nonzero(starts == None) + np.count_nonzero(ends == None))  # noqa: E711
+
+def check_transcript_document(transcription):
+    """Runs the timestamp assertions against one transcript document."""
+    segments = transcription.get("segments") or EMPTY_LIST
+
+    if not segments:
+        print("❌ No transcript segments found")
+        return False
+
+    # Buffer the report and emit it as one write: a single flush instead
+    # of one per line, which matters when stdout is a pipe
+    segment_count = len(segments)
+    lines = [f"✅ Found {segment_count} transcript segments"]
+
+    # Detail for the first few segments; islice walks them without
+    # copying out a head list
+    if VERBOSE:
+        for i, segment in enumerate(islice(segments, 3)):
+            start_time, end_time = segment.get("startTime"), segment.get("endTime")
+            text = segment.get("text")
+            preview = text[:50] if text else ""
+            lines.append(SEGMENT_TEMPLATE % (i + 1, start_time, end_time, preview))
+            if start_time is None or end_time is None:
+                lines.append(f"     ❌ Missing timestamps!")
+            else:
+                lines.append(f"     ✅ Timestamps present")
+
+    # The verdict covers every segment, not just the printed head
+    timestamp_issues = count_missing_timestamps(segments)
+
+    if timestamp_issues == 0:
+        lines.append(f"\n🎉 SUCCESS: All segments have timestamps!")
+    else:
+        lines.append(f"\n❌ FAILED: {timestamp_issues} timestamps missing across {segment_count} segments")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    return timestamp_issues == 0
+
+async def check_transcripts_meta(client, project_id):
+    """Validates timestamps from the transcript meta summary alone."""
+    response = await client.get(f"{BASE_URL}/projects/{project_id}/transcripts/meta")
+    if response.status_code != 200:
+        print(f"❌ API Error: {response.status_code} - {response.text}")
         return False
-    
+
+    meta = orjson.loads(response.content).get("data") or EMPTY_DICT
+    first_segments = meta.get("firstSegments") or EMPTY_LIST
+    ok = (
+        meta.get("segmentCount", 0) > 0
+        and meta.get("nullTimestampCount", 0) == 0
+        and all(s.get("s") is not None and s.get("e") is not None for s in first_segments)
+    )
+
+    if ok:
+        print(f"🎉 SUCCESS: {meta['segmentCount']} segments, all timestamps present!")
+    else:
+        print(
+            f"❌ FAILED: {meta.get('nullTimestampCount', 'all')} of "
+            f"{meta.get('segmentCount', 0)} segments missing timestamps"
+        )
+    return ok
+
+async def test_transcription_timestamps(client, project_id):
+    """Test that transcription API returns proper timestamps for one project"""
+    print(f"\n🧪 Testing Transcription Timestamp Fix for project {project_id}...")
+
     try:
-        headers = {"Authorization": f"Bearer {TOKEN}"}
-        response = requests.get(f"{BASE_URL}/projects/{PROJECT_ID}/transcripts", headers=headers)
-        
+        if COUNT_ONLY:
+            return await check_transcripts_meta(client, project_id)
+
+        # Project only the fields the check reads; the server truncates
+        # text to the 50-char preview instead of shipping full transcripts
+        status_code, body = await fetch_with_etag_cache(
+            client,
+            f"{BASE_URL}/projects/{project_id}/transcripts?fields=startTime,endTime,text:50",
+        )
+
+        if status_code != 200:
+            print(f"❌ API Error: {status_code} - {body.decode(errors='replace')}")
+            return False
+
+        # Silent runs only need pass/fail, which the byte probe answers
+        # without decoding the JSON at all; the parsed path below stays for
+        # runs that want per-segment diagnostics
+        if not VERBOSE:
+            ok = probe_timestamps_bytes(body)
+            sys.stdout.write(
+                "🎉 SUCCESS: All segments have timestamps!\n" if ok
+                else "❌ FAILED: segments missing timestamps\n"
+            )
+            return ok
+
+        # Parse the raw bytes with orjson: no intermediate str decode, and
+        # large segment lists deserialize several times faster than stdlib json
+        data = orjson.loads(body)
+
+        if not data.get("success"):
+            print(f"❌ API returned error: {data.get('error')}")
+            return False
+
+        return check_transcript_document(data.get("data") or EMPTY_DICT)
+
+    except (httpx.HTTPError, OSError, ValueError, KeyError) as e:
+        # Only stringify the exception when the run wants diagnostics;
+        # the silent path reports just the type
+        if VERBOSE:
+            print(f"❌ Test failed with error: {e}")
+        else:
+            print(f"❌ Test failed: {type(e).__name__}")
+        return False
+
+async def test_transcription_timestamps_bulk(client):
+    """Checks every project from one bulk request.
+
+    A single GET to /projects/transcripts?ids=... pays one round-trip and
+    one parse for all projects instead of one per project.
+    """
+    try:
+        response = await client.get(
+            f"{BASE_URL}/projects/transcripts",
+            params={"ids": ",".join(PROJECT_IDS)},
+        )
+
         if response.status_code != 200:
             print(f"❌ API Error: {response.status_code} - {response.text}")
             return False
-        
-        data = response.json()
-        
+
+        data = orjson.loads(response.content)
+
         if not data.get("success"):
             print(f"❌ API returned error: {data.get('error')}")
             return False
-        
-        transcription = data.get("data", {})
-        segments = transcription.get("segments", [])
-        
-        if not segments:
-            print("❌ No transcript segments found")
-            return False
-        
-        print(f"✅ Found {len(segments)} transcript segments")
-        
-        # Check timestamps in first few segments
-        timestamp_issues = 0
-        for i, segment in enumerate(segments[:3]):
-            start_time = segment.get("startTime")
-            end_time = segment.get("endTime")
-            text = segment.get("text", "")[:50]
-            
-            print(f"   Segment {i+1}: start={start_time}, end={end_time}, text='{text}...'")
-            
-            if start_time is None or end_time is None:
-                timestamp_issues += 1
-                print(f"     ❌ Missing timestamps!")
+
+        documents = data.get("data") or EMPTY_DICT
+        results = []
+        for project_id in PROJECT_IDS:
+            print(f"\n🧪 Testing Transcription Timestamp Fix for project {project_id}...")
+            transcription = documents.get(project_id)
+            if transcription is None:
+                print("❌ Project not found in bulk response")
+                results.append(False)
             else:
-                print(f"     ✅ Timestamps present")
-        
-        if timestamp_issues == 0:
-            print(f"\n🎉 SUCCESS: All segments have timestamps!")
-            return True
+                results.append(check_transcript_document(transcription))
+        return all(results)
+
+    except (httpx.HTTPError, OSError, ValueError, KeyError) as e:
+        # Only stringify the exception when the run wants diagnostics;
+        # the silent path reports just the type
+        if VERBOSE:
+            print(f"❌ Test failed with error: {e}")
         else:
-            print(f"\n❌ FAILED: {timestamp_issues} segments missing timestamps")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Test failed with error: {e}")
+            print(f"❌ Test failed: {type(e).__name__}")
         return False
 
+async def run_all_projects():
+    """Checks every configured project on one pooled client.
+
+    Multiple projects go through the bulk endpoint (one round-trip for
+    all of them); a single project keeps the conditional-GET path so the
+    ETag cache still applies.
+    """
+    # When the backend listens on a Unix socket (BACKEND_UDS in
+    # start_backend), talk to it directly and skip the TCP loopback stack;
+    # the URL host is then only used for the Host header
+    uds_path = os.environ.get("BACKEND_UDS")
+    transport = None
+    if uds_path and os.path.exists(uds_path):
+        transport = httpx.AsyncHTTPTransport(uds=uds_path, http2=True)
+
+    async with httpx.AsyncClient(
+        http2=True,
+        transport=transport,
+        headers={
+            "Authorization": f"Bearer {TOKEN}",
+            "Accept-Encoding": "gzip",
+        },
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+    ) as client:
+        # Count-only mode stays per-project: the meta probes are tiny and
+        # gather in parallel anyway
+        if len(PROJECT_IDS) > 1 and not COUNT_ONLY:
+            return await test_transcription_timestamps_bulk(client)
+        results = await asyncio.gather(
+            *[test_transcription_timestamps(client, pid) for pid in PROJECT_IDS]
+        )
+    return all(results)
+
 def get_sample_project_info():
     """Helper to get project info for testing"""
     print("\n📋 To test transcription fixes:")
@@ -80,16 +297,20 @@ def get_sample_project_info():
     print("2. Register/login to get an auth token")
     print("3. Create a project with a video file")
     print("4. Wait for transcription to complete")
-    print("5. Update this test script with PROJECT_ID and TOKEN")
+    print("5. Update this test script with PROJECT_IDS and TOKEN")
     print("6. Run: python src/tests/test_transcription_fix.py")
 
 if __name__ == "__main__":
     print("🎵 Transcription Timestamp Fix Test")
     print("=" * 50)
-    
-    success = test_transcription_timestamps()
-    
+
+    if "YOUR_PROJECT_ID_HERE" in PROJECT_IDS or TOKEN == "YOUR_AUTH_TOKEN_HERE":
+        print("❌ Please update the test script with actual PROJECT_IDS and TOKEN")
+        success = False
+    else:
+        success = asyncio.run(run_all_projects())
+
     if not success:
         get_sample_project_info()
-    
-    print("\n" + "=" * 50) 
\ No newline at end of file
+
+    print("\n" + "=" * 50)